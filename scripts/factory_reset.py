@@ -1,3 +1,5 @@
+import sys
+
 from lumed_ips.ips_control import IpsLaser
 
 if __name__ == "__main__":
@@ -6,7 +8,8 @@ if __name__ == "__main__":
     
     print("Connected lasers:")
     if available_lasers:
-        for i, laser_name in enumerate(available_lasers):
+        laser_names = list(available_lasers)
+        for i, laser_name in enumerate(laser_names):
             print(f"\t{i}) ", laser_name)
         selected_laser = int(
             input(
@@ -14,14 +17,13 @@ if __name__ == "__main__":
             )
             or 0
         )
-        laser.comport = list(available_lasers)[selected_laser]
+        laser.comport = laser_names[selected_laser]
     else:
         print("\tNo laser found")
-        exit()
+        sys.exit(1)
         
     print(f"Connecting to laser {laser.comport}")
-    laser.connect()
-    laser.get_info()
+    laser.connect(idn=available_lasers[laser.comport]["idn"])
     
     print(f"Returning laser to factory settings - {laser.comport}")
     print(laser.restore_factory_settings())
@@ -1,18 +1,18 @@
-import logging
 import sys
 
-import qtmodern.styles
-from PyQt5.QtWidgets import QApplication, QMainWindow
 
-from lumed_ips.ips_widget import IpsLaserWidget
+def main():
+    """Launches the IPS laser widget in its own window.
+
+    Qt is imported here so that importing lumed_ips does not load it.
+    """
+    import qtmodern.styles
+    from PyQt5.QtWidgets import QApplication, QMainWindow
+
+    from lumed_ips.ips_widget import IpsLaserWidget, configure_logger
 
-if __name__ == "__main__":
     # Set up logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(message)s",
-        handlers=[logging.FileHandler("debug.log"), logging.StreamHandler(sys.stdout)],
-    )
+    configure_logger()
 
     app = QApplication(sys.argv)
 
@@ -24,4 +24,8 @@ if __name__ == "__main__":
 
     window.setCentralWidget(IpsLaserWidget())
 
-    app.exec_()
+    return app.exec_()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
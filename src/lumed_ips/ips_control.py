@@ -1,62 +1,132 @@
 """Module to control IPS laser by comunnicating in serial with pyvisa."""
 
+import asyncio
 import importlib.metadata
 import logging
 import math
 import re
-from dataclasses import dataclass
+import sys
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from pathlib import Path
 from threading import Lock
+from types import MappingProxyType
+from typing import Any
 
 import pyvisa
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+from serial import SerialException
+from serial.tools import list_ports
+
+logger = logging.getLogger(__name__)
+
+
+# Errors of the serial link itself, no laser error could be read back. Both
+# lie outside the -100 to -999 range of the SCPI communication errors
+TRANSPORT_ERROR = -1
+PARSE_ERROR = -2
+
+# Failures of the serial link reported as TRANSPORT_ERROR. pyvisa-py only
+# turns timeouts into VisaIOError, an unplugged port raises SerialException
+_TRANSPORT_EXCEPTIONS = (pyvisa.errors.VisaIOError, SerialException, OSError)
+
+ERROR_CODES = MappingProxyType(
+    {
+        TRANSPORT_ERROR: "TRANSPORT_ERROR",  # Serial communication error
+        PARSE_ERROR: "PARSE_ERROR",  # Serial communication error
+        0: "NO_ERROR",  # Hardware error
+        3011: "HOUSEKEEPING",  # Hardware error
+        3012: "FLASH_INITIALIZATION_FAILED",  # Hardware error
+        3013: "FLASH_HOUSEKEEPING_FAILED",  # Hardware error
+        3014: "LOW_VOLTAGE_EVENT",  # Hardware error
+        3015: "BAD_VOLTAGE_3V3",  # Hardware error
+        3016: "BAD_VOLTAGE_VIN",  # Hardware error
+        3017: "BAD_VOLTAGE_VTEC",  # Hardware error
+        3018: "HIGH_INPUT_CURRENT",  # Hardware error
+        3019: "TEC_UPDT_ON_BRD_STATE_BAD",  # Hardware error
+        3020: "TEC_UPDT_ON_TEMP_LONG_BAD",  # Hardware error
+        3021: "TEC_UPDT_ON_TEMP_OUT_SETPT",  # Hardware error
+        3022: "TEC_UPDT_ON_TEMP_OUT_RANGE",  # Hardware error
+        3097: "FAILED_INITIAL_POST",  # Hardware error
+        3098: "FLASH_PARAMS_REINITIALIZED",  # Hardware error
+        3099: "UNIDENTIFIED_ERROR",  # Hardware error
+        -102: "Syntax error",  # Communication error
+        -103: "Invalid separator",  # Communication error
+        -108: "Parameter not allowed",  # Communication error
+        -109: "Missing parameter",  # Communication error
+        -113: "Undefined header",  # Communication error
+        -131: "Invalid suffix",  # Communication error
+        -138: "Suffix not allowed",  # Communication error
+        -200: "Execution error",  # Communication error
+        -224: "Illegal parameter value",  # Communication error
+    }
+)
+_NO_ERROR_MSG = ERROR_CODES[0]
+
+STATUS = MappingProxyType(
+    {
+        0: "unknown state",
+        1: "board passed POST",
+        2: "board failed POST",
+        3: "board in normal state",
+        4: "board in fault state",
+        5: "board in boot load state",
+        6: "board not attached",
+    }
 )
-logger = logging.getLogger()
-
-
-ERROR_CODES = {
-    0: "NO_ERROR",  # Hardware error
-    3011: "HOUSEKEEPING",  # Hardware error
-    3012: "FLASH_INITIALIZATION_FAILED",  # Hardware error
-    3013: "FLASH_HOUSEKEEPING_FAILED",  # Hardware error
-    3014: "LOW_VOLTAGE_EVENT",  # Hardware error
-    3015: "BAD_VOLTAGE_3V3",  # Hardware error
-    3016: "BAD_VOLTAGE_VIN",  # Hardware error
-    3017: "BAD_VOLTAGE_VTEC",  # Hardware error
-    3018: "HIGH_INPUT_CURRENT",  # Hardware error
-    3019: "TEC_UPDT_ON_BRD_STATE_BAD",  # Hardware error
-    3020: "TEC_UPDT_ON_TEMP_LONG_BAD",  # Hardware error
-    3021: "TEC_UPDT_ON_TEMP_OUT_SETPT",  # Hardware error
-    3022: "TEC_UPDT_ON_TEMP_OUT_RANGE",  # Hardware error
-    3097: "FAILED_INITIAL_POST",  # Hardware error
-    3098: "FLASH_PARAMS_REINITIALIZED",  # Hardware error
-    3099: "UNIDENTIFIED_ERROR",  # Hardware error
-    -102: "Syntax error",  # Communication error
-    -103: "Invalid separator",  # Communication error
-    -108: "Parameter not allowed",  # Communication error
-    -109: "Missing parameter",  # Communication error
-    -113: "Undefined header",  # Communication error
-    -131: "Invalid suffix",  # Communication error
-    -138: "Suffix not allowed",  # Communication error
-    -200: "Execution error",  # Communication error
-    -224: "Illegal parameter value",  # Communication error
-}
-
-STATUS = {
-    0: "unknown state",
-    1: "board passed POST",
-    2: "board failed POST",
-    3: "board in normal state",
-    4: "board in fault state",
-    5: "board in boot load state",
-    6: "board not attached",
-}
 
 _STM_BYID_PREFIX = "usb-STMicroelectronics_STM32_Virtual_COM_Port"
+# USB vendor and product ids of the STM32 Virtual COM Port
+_STM_VCP_USB_ID = (0x0483, 0x5740)
 _TTY_ACM_RE = re.compile(r"^/dev/ttyACM\d+$")
+_ASRL_TTY_RE = re.compile(r"^ASRL/dev/(tty\w+)::INSTR$")
+_LATENCY_TIMER_PATH = "/sys/bus/usb-serial/devices/{tty}/latency_timer"
+
+_RM: pyvisa.ResourceManager | None = None
+
+# Commands chained in a single program message are separated by ";" and the
+# laser separates the answers to chained queries the same way.
+_SCPI_SEPARATOR = ";"
+_ERROR_QUERY = "Error?"
+# Upper bound of error queue entries read by flush_errors()
+_MAX_QUEUED_ERRORS = 32
+
+# Telemetry read by get_info() in a single compound query
+_INFO_QUERIES = (
+    "Laser:Enable?",
+    "Laser:Current?",
+    "Laser:Power?",
+    "Laser:Temperature?",
+)
+
+# Installed package version, reported in IPSInfo
+_LUMED_IPS_V = importlib.metadata.version("lumed_ips")
+
+# Number followed by an optional unit, see str2float()
+_FLOAT_RE = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*(\w+)?\s*$")
+
+# <code>,"<message>" answer of the error query, alone or at the end of a
+# compound reply (answers before the last separator are the query answers)
+_ERR_RE = re.compile(r'\s*(-?\d+)\s*,\s*"?(.*?)"?\s*$', re.S)
+_QUERY_REPLY_RE = re.compile(
+    r'\s*(.*?)\s*;\s*(-?\d+)\s*,\s*"?([^;]*?)"?\s*$', re.S
+)
+
+_CHUNK_SIZE = 65536
+_TIMEOUT_MS = 500
+
+# Telemetry getters reuse answers younger than this (seconds)
+_CACHE_TTL_S = 0.2
+
+# find_ips_laser() reuses its last result for this long (seconds)
+_DISCOVERY_TTL_S = 5.0
+_LASER_CACHE: dict[str, Any] = {"ts": 0.0, "key": None, "val": None}
+
+# Upper bound of the ports probed concurrently by find_ips_laser()
+_MAX_PROBE_WORKERS = 8
+# Time given to a probed port to finish replying once its first byte arrived
+_PROBE_REPLY_TIMEOUT_MS = 1000
 
 
 def str2float(string: str) -> float:
@@ -74,14 +144,57 @@ def str2float(string: str) -> float:
     :return: the parsed float
     :rtype: float
     """
-    pattern = r"^\s*(-?\d+(\.\d+)?)\s*(\w+)?\s*$"
-    match = re.match(pattern, string.strip())
+    string = string.strip()
+    # Fast path for the unitless answers of the laser, restricted to what
+    # the regular expression accepts: float() alone would also parse "1e5",
+    # "+5" or "1_0"
+    number = string.removeprefix("-")
+    integer, point, decimals = number.partition(".")
+    if (
+        number.isascii()
+        and integer.isdigit()
+        and (not point or decimals.isdigit())
+    ):
+        return float(string)
+    match = _FLOAT_RE.match(string)
     if match:
-        number = float(match.group(1))
-    else:
-        number = math.nan
+        return float(match.group(1))
+    return math.nan
 
-    return float(number)
+
+def _parse_error(reply: str) -> tuple[int, str]:
+    """
+    Parse a ``<code>,"<message>"`` error query answer.
+
+    :param reply: raw answer of the error query
+    :type reply: str
+    :raises ValueError: if the answer is not an error code and message
+    :return: the error code and message
+    :rtype: tuple[int, str]
+    """
+    match = _ERR_RE.match(reply)
+    if match is None:
+        raise ValueError(f"Unexpected error reply: {reply!r}")
+    return int(match.group(1)), match.group(2)
+
+
+def _get_rm() -> pyvisa.ResourceManager:
+    """
+    Return the process-wide pyvisa ResourceManager, creating it on first use.
+
+    Building a ResourceManager scans the available backends and is slow, so a
+    single instance is shared by every IpsLaser object.
+    """
+    global _RM
+    if _RM is None:
+        _RM = pyvisa.ResourceManager("@py")
+    return _RM
+
+
+def invalidate_discovery_cache() -> None:
+    """Forgets the last find_ips_laser() result, e.g. after plugging a
+    laser, so that the next call probes the ports again."""
+    _LASER_CACHE.update(ts=0.0, key=None, val=None)
 
 
 def _find_stm32_vcp_tty() -> list[str]:
@@ -108,8 +221,65 @@ def _find_stm32_vcp_tty() -> list[str]:
     return ttys
 
 
-@dataclass
+def _find_stm32_vcp_ports() -> list[str]:
+    """
+    Return the serial port names (e.g. COM3) of the STM32 Virtual COM Ports,
+    identified by their USB vendor and product ids. Used where there are no
+    /dev/serial/by-id links.
+    """
+    try:
+        ports = list_ports.comports()
+    except Exception as e:
+        logger.warning("find_ips_laser: port listing failed (%s)", e)
+        return []
+    return [
+        port.device
+        for port in ports
+        if (port.vid, port.pid) == _STM_VCP_USB_ID
+    ]
+
+
+def _set_low_latency(resource_name: str) -> bool:
+    """
+    Best-effort drop of the USB-serial ``latency_timer`` to 1 ms for the tty
+    behind an ``ASRL/dev/<tty>::INSTR`` resource name.
+
+    Only usb-serial drivers (FTDI and friends) expose the attribute; other
+    platforms and drivers are a silent no-op.
+
+    :param resource_name: pyvisa resource name of the laser
+    :type resource_name: str
+    :return: True if the latency timer was set
+    :rtype: bool
+    """
+    match = _ASRL_TTY_RE.match(resource_name or "")
+    if not match:
+        return False
+
+    latency_timer = _LATENCY_TIMER_PATH.format(tty=match.group(1))
+
+    if not Path(latency_timer).exists():
+        logger.debug("No latency_timer exposed for %s", resource_name)
+        return False
+
+    try:
+        Path(latency_timer).write_text("1")
+    except OSError as e:
+        logger.warning(
+            "Could not set %s to 1 ms (%s). Grant write access with chmod "
+            "or a udev rule to reduce serial latency.",
+            latency_timer,
+            e,
+        )
+        return False
+
+    return True
+
+
+@dataclass(frozen=True, slots=True)
 class IPSInfo:
+    """Snapshot of the laser state, replaced as a whole by get_info."""
+
     model: str = ""
     serial_number: str = ""
     is_connected: bool = False
@@ -119,99 +289,221 @@ class IPSInfo:
     laser_current: float = float("nan")
     laser_target_current: float = float("nan")
     laser_power: float = float("nan")
-    lumed_ips_v: str = importlib.metadata.version("lumed_ips")
+    lumed_ips_v: str = _LUMED_IPS_V
 
 
 class IpsLaser:
-    """Control IPS Dual Laser."""
+    """Control IPS Dual Laser.
+
+    Parameter : <check_errors> (bool) : If False, commands and queries are
+    sent without the trailing error query and always report no error; use
+    flush_errors() to read the laser errors.
+    """
 
-    def __init__(self) -> None:
+    __slots__ = (
+        "idn",
+        "comport",
+        "pyvisa_serial",
+        "_mutex",
+        "isconnected",
+        "isenabled",
+        "target_current",
+        "ressource_manage",
+        "info",
+        "_cache",
+        "_last_error",
+        "_idn_fields",
+        "_info_key",
+        "_check_errors",
+    )
+
+    def __init__(self, check_errors: bool = True) -> None:
+        self._check_errors: bool = check_errors
         self.idn: str | None = None
         self.comport: str | None = None
         self.pyvisa_serial: pyvisa.resources.serial.SerialInstrument | None = (
             None
         )
 
+        # Serializes the serial round-trips of the GUI and poller threads. An
+        # uncontended Lock costs far less than handing each transaction to a
+        # dedicated I/O thread
         self._mutex: Lock = Lock()
         self.isconnected: bool = False
         self.isenabled: bool = False
         self.target_current: int = 0
-        self.ressource_manage = pyvisa.ResourceManager("@py")
+        self.ressource_manage = _get_rm()
         self.info = IPSInfo()
+        self._cache: dict[str, tuple[float, Any]] = {}
+        # Last laser error reported by get_info, logged only when it changes
+        self._last_error: int = 0
+        # (idn, model, serial_number, wavelength) parsed from self.idn
+        self._idn_fields: tuple[str, str, str, float] | None = None
+        # Raw values self.info was built from, see get_info()
+        self._info_key: tuple | None = None
 
     # Device lookup methods
 
+    def _probe_port(
+        self,
+        resource_name: str,
+        baud_rate: int,
+        timeout_ms: int,
+        idn_query: str,
+    ) -> str | None:
+        """
+        Open a candidate resource, query its identification string and close it.
+
+        <timeout_ms> only bounds the wait for the first byte of the reply; a
+        device that started answering gets _PROBE_REPLY_TIMEOUT_MS to finish.
+
+        Returns:
+            the stripped IDN reply, or None if the probe failed
+        """
+        dev = None
+        try:
+            logger.info("find_ips_laser: probing %s", resource_name)
+            dev = self.ressource_manage.open_resource(resource_name)
+
+            # Apply serial configuration before probing
+            try:
+                dev.baud_rate = baud_rate
+            except Exception:
+                pass
+
+            # Terminations matter a lot for SCPI-ish devices
+            try:
+                dev.write_termination = "\n"
+                dev.read_termination = "\n"
+            except Exception:
+                pass
+
+            dev.chunk_size = _CHUNK_SIZE
+            dev.timeout = int(timeout_ms)
+
+            dev.write(idn_query)
+            reply = dev.read_bytes(1)
+            if not reply.endswith(b"\n"):
+                dev.timeout = _PROBE_REPLY_TIMEOUT_MS
+                reply += dev.read_bytes(_CHUNK_SIZE, break_on_termchar=True)
+            idn = reply.decode("ascii", errors="replace").strip()
+            logger.info(
+                "find_ips_laser: %s replied IDN=%r", resource_name, idn
+            )
+            return idn
+
+        except Exception as e:
+            logger.warning(
+                "find_ips_laser: probe failed on %s (%s: %s)",
+                resource_name,
+                type(e).__name__,
+                e,
+            )
+            return None
+        finally:
+            # Don’t leave resources open after probing
+            if dev is not None:
+                try:
+                    dev.close()
+                except Exception:
+                    pass
+
+    def _list_serial_resources(self) -> dict[str, Any]:
+        """Lists the serial resources of the backend with one ASRL query.
+
+        Returns:
+            {resource_name: ResourceInfo}
+        """
+        try:
+            return dict(
+                self.ressource_manage.list_resources_info(
+                    query="ASRL?*::INSTR"
+                )
+            )
+        except Exception as e:
+            logger.warning("find_ips_laser: enumeration failed (%s)", e)
+            return {}
+
     def find_ips_laser(
         self,
         *,
         baud_rate: int = 115200,
-        timeout_ms: int = 50,
+        timeout_ms: int = 250,
         idn_query: str = "*IDN?",
         match_substring: str = "IPS",
+        force: bool = False,
     ) -> dict[str, dict]:
         """
         Find IPS lasers available for connection through the pyvisa ResourceManager.
 
+        Candidate ports are probed concurrently, so the discovery takes about
+        one probe timeout regardless of the number of candidates. The result
+        is reused for a few seconds unless <force> is True.
+
         Returns:
-            {resource_name: {"ressourceInfo": dict, "idn": str}}
+            {resource_name: {"ressourceInfo": dict, "idn": str}}, ordered by
+            resource name
         """
-        ttys = _find_stm32_vcp_tty()
+        cache_key = (baud_rate, timeout_ms, idn_query, match_substring)
+        if (
+            not force
+            and _LASER_CACHE["key"] == cache_key
+            and time.monotonic() - _LASER_CACHE["ts"] < _DISCOVERY_TTL_S
+        ):
+            logger.info("find_ips_laser: reusing cached discovery")
+            return dict(_LASER_CACHE["val"])
+
+        if sys.platform == "linux":
+            ports = _find_stm32_vcp_tty()
+        else:
+            # There are no udev by-id links outside Linux, the STM32 ports
+            # are told apart by their USB ids instead
+            ports = _find_stm32_vcp_ports()
         # de-dup + stable order
-        ttys = sorted(set(ttys))
+        resource_names = [f"ASRL{port}::INSTR" for port in sorted(set(ports))]
+        resources_info: dict[str, Any] = {}
+        if resource_names and sys.platform != "linux":
+            resources_info = self._list_serial_resources()
 
         logger.info(
-            "find_ips_laser: %d serial candidate(s) detected", len(ttys)
+            "find_ips_laser: %d serial candidate(s) detected",
+            len(resource_names),
         )
 
-        available_lasers: dict[str, dict] = {}
-
-        for tty in ttys:
-            resource_name = f"ASRL{tty}::INSTR"
-            dev = None
-            try:
-                logger.info("find_ips_laser: probing %s", resource_name)
-                dev = self.ressource_manage.open_resource(resource_name)
-
-                # Apply serial configuration before probing
-                try:
-                    dev.baud_rate = baud_rate
-                except Exception:
-                    pass
+        # A session kept open by soft_disconnect() would make the probe of
+        # its port fail where serial ports are exclusive (Windows), it is
+        # closed. A connected laser is not probed, its IDN is reused
+        if self.pyvisa_serial is not None and not self.isconnected:
+            self.close()
+        held_port = (
+            self.pyvisa_serial.resource_name
+            if self.pyvisa_serial is not None
+            else None
+        )
 
-                # Terminations matter a lot for SCPI-ish devices
-                try:
-                    dev.write_termination = "\n"
-                    dev.read_termination = "\n"
-                except Exception:
-                    pass
+        def probe(resource_name: str) -> str | None:
+            if resource_name == held_port:
+                return self.idn or self.get_id()[0] or None
+            return self._probe_port(
+                resource_name, baud_rate, timeout_ms, idn_query
+            )
 
-                dev.timeout = int(timeout_ms)
+        idns = []
+        if resource_names:
+            # One thread per candidate, the probes mostly wait on timeouts
+            with ThreadPoolExecutor(
+                max_workers=min(len(resource_names), _MAX_PROBE_WORKERS)
+            ) as executor:
+                idns = list(executor.map(probe, resource_names))
 
-                idn = (dev.query(idn_query) or "").strip()
-                logger.info(
-                    "find_ips_laser: %s replied IDN=%r", resource_name, idn
-                )
+        available_lasers: dict[str, dict] = {}
 
-            except Exception as e:
-                logger.warning(
-                    "find_ips_laser: probe failed on %s (%s: %s)",
-                    resource_name,
-                    type(e).__name__,
-                    e,
-                )
-                continue
-            finally:
-                # Don’t leave resources open after probing
-                if dev is not None:
-                    try:
-                        dev.close()
-                    except Exception:
-                        pass
-
-            if match_substring in idn:
+        for resource_name, idn in zip(resource_names, idns):
+            if idn is not None and match_substring in idn:
                 available_lasers[resource_name] = {
-                    # You no longer have VISA ResourceInfo from list_resources_info; keep empty
-                    "ressourceInfo": {},
+                    # Only known when the candidates came from the backend
+                    # enumeration
+                    "ressourceInfo": resources_info.get(resource_name, {}),
                     "idn": idn,
                 }
                 logger.info(
@@ -221,32 +513,87 @@ class IpsLaser:
         logger.info(
             "find_ips_laser: %d IPS laser(s) found", len(available_lasers)
         )
+        _LASER_CACHE.update(
+            ts=time.monotonic(), key=cache_key, val=dict(available_lasers)
+        )
         return available_lasers
 
     ## Basic methods
 
-    def _safe_scpi_write(self, message: str) -> (int, str):
+    def _transaction(self, message: str) -> str:
+        """Writes <message> and reads the answer up to the read termination.
+
+        The answer is read with read_bytes, which stops as soon as the
+        termination character arrives, and is decoded once. The caller must
+        hold self._mutex.
+        """
+        self.pyvisa_serial.write(message)
+        data = self.pyvisa_serial.read_bytes(
+            self.pyvisa_serial.chunk_size, break_on_termchar=True
+        )
+        return data.decode("ascii", errors="replace")
+
+    def _pipeline_queries(self, queries: tuple[str, ...]) -> list[str]:
+        """Writes every query before reading their answers, so that the
+        laser input buffer hides all round-trips but one.
+
+        Returns the stripped answers, in the order of <queries>.
+        """
+        chunk_size = self.pyvisa_serial.chunk_size
+        with self._mutex:
+            for query in queries:
+                self.pyvisa_serial.write(query)
+            replies = [
+                self.pyvisa_serial.read_bytes(
+                    chunk_size, break_on_termchar=True
+                )
+                for _ in queries
+            ]
+        return [
+            reply.decode("ascii", errors="replace").strip()
+            for reply in replies
+        ]
+
+    def _safe_scpi_write(self, message: str, check: bool = True) -> (int, str):
         """Sends a serial message to the laser and verifies if any communication error occured.
 
         Parameter : <message> (string) : Message send to the laser by serial.
         The command syntax for those messages is explained in the documentation provided by IPS.  %
+        Parameter : <check> (bool) : If False, the message is written without
+        reading the error back; errors stay queued for flush_errors().
+
+        The message and the error query are sent as a single compound command
+        (``<message>;Error?``) so that only one round-trip is needed.
 
         Returns:
         <err_code> : communication error code
         <err_message> : communication error message
         """
         if not self.isconnected:
-            return 0, ERROR_CODES[0]
-        with self._mutex:
+            return 0, _NO_ERROR_MSG
+        if not (check and self._check_errors):
             try:
-                self.pyvisa_serial.write(message)
-                err_msg = self.pyvisa_serial.query("Error?").strip()
-                err_code = err_msg.split(",")[0]
-                err_msg = err_msg.split(",")[-1].strip().strip('"')
-            except Exception as e:
+                with self._mutex:
+                    self.pyvisa_serial.write(message)
+            except _TRANSPORT_EXCEPTIONS as e:
                 logger.error(e)
-
-        return err_code, err_msg
+                return TRANSPORT_ERROR, ERROR_CODES[TRANSPORT_ERROR]
+            return 0, _NO_ERROR_MSG
+        try:
+            # Only the serial round-trip holds the lock, the reply is parsed
+            # after releasing it
+            with self._mutex:
+                reply = self._transaction(
+                    f"{message}{_SCPI_SEPARATOR}{_ERROR_QUERY}"
+                )
+        except _TRANSPORT_EXCEPTIONS as e:
+            logger.error(e)
+            return TRANSPORT_ERROR, ERROR_CODES[TRANSPORT_ERROR]
+        try:
+            return _parse_error(reply)
+        except ValueError as e:
+            logger.error(e)
+            return PARSE_ERROR, ERROR_CODES[PARSE_ERROR]
 
     def _safe_scpi_query(self, message: str) -> (str, int, str):
         """Sends a serial message to the laser, reads the err_code and
@@ -259,17 +606,129 @@ class IpsLaser:
         <value> (string) : Answer provided by the laser to the serial COM.
         <err_code> : communication error code
         <err_msg> : communication error message
+
+        The query and the error query are sent as a single compound command
+        (``<message>;Error?``); the laser separates both answers with ``;``.
+
+        If the serial link fails or the reply cannot be parsed, <value> is
+        empty and <err_code> is TRANSPORT_ERROR or PARSE_ERROR.
         """
-        with self._mutex:
+        if not self._check_errors:
             try:
-                answer = self.pyvisa_serial.query(message).strip()
-                err_msg = self.pyvisa_serial.query("Error?").strip()
-                err_code = int(err_msg.split(",")[0])
-                err_msg = err_msg.split(",")[-1].strip().strip('"')
-            except Exception as e:
+                with self._mutex:
+                    reply = self._transaction(message)
+            except _TRANSPORT_EXCEPTIONS as e:
                 logger.error(e)
+                return "", TRANSPORT_ERROR, ERROR_CODES[TRANSPORT_ERROR]
+            return reply.strip(), 0, _NO_ERROR_MSG
+        try:
+            # Only the serial round-trip holds the lock, the reply is parsed
+            # after releasing it
+            with self._mutex:
+                reply = self._transaction(
+                    f"{message}{_SCPI_SEPARATOR}{_ERROR_QUERY}"
+                )
+        except _TRANSPORT_EXCEPTIONS as e:
+            logger.error(e)
+            return "", TRANSPORT_ERROR, ERROR_CODES[TRANSPORT_ERROR]
+        match = _QUERY_REPLY_RE.match(reply)
+        if match is None:
+            logger.error("Unexpected reply to %s: %r", message, reply)
+            return "", PARSE_ERROR, ERROR_CODES[PARSE_ERROR]
+        return match.group(1), int(match.group(2)), match.group(3)
+
+    def _safe_scpi_compound(
+        self, queries: tuple[str, ...]
+    ) -> tuple[list[str], int, str]:
+        """Sends <queries> as a single compound query, followed by the error
+        query, and splits the reply into one answer per query.
 
-        return answer, err_code, err_msg
+        Returns:
+        <answers> (list) : Answers to the queries, in the same order.
+        <err_code> : communication error code
+        <err_msg> : communication error message
+
+        If the compound reply does not hold one answer per query, the queries
+        are sent again as separate pipelined messages. If the laser reports
+        an error, only the queries left without an answer are sent again,
+        one by one. The reported error is returned, the errors of the
+        separate queries are only logged.
+        """
+        answer, err_code, err_msg = self._safe_scpi_query(
+            _SCPI_SEPARATOR.join(queries)
+        )
+        if err_code == TRANSPORT_ERROR:
+            return [""] * len(queries), err_code, err_msg
+        answers = answer.split(_SCPI_SEPARATOR)
+        if len(answers) != len(queries):
+            logger.debug(
+                "Expected %d answers, got %r, pipelining the queries",
+                len(queries),
+                answer,
+            )
+            try:
+                if self._check_errors:
+                    *answers, error = self._pipeline_queries(
+                        (*queries, _ERROR_QUERY)
+                    )
+                    err_code, err_msg = _parse_error(error)
+                else:
+                    answers = self._pipeline_queries(queries)
+            except _TRANSPORT_EXCEPTIONS as e:
+                logger.error(e)
+                return (
+                    [""] * len(queries),
+                    TRANSPORT_ERROR,
+                    ERROR_CODES[TRANSPORT_ERROR],
+                )
+            except ValueError as e:
+                logger.error(e)
+                return (
+                    [""] * len(queries),
+                    PARSE_ERROR,
+                    ERROR_CODES[PARSE_ERROR],
+                )
+        if err_code != 0 and "" in answers:
+            for i, query in enumerate(queries):
+                if answers[i]:
+                    continue
+                answers[i], query_code, query_msg = self._safe_scpi_query(
+                    query
+                )
+                if query_code != 0:
+                    logger.warning(
+                        "Laser error %s, %s on %s",
+                        query_code,
+                        query_msg,
+                        query,
+                    )
+        return answers, err_code, err_msg
+
+    def _cached(
+        self, key: str, query: Callable[[], Any], ttl: float = _CACHE_TTL_S
+    ) -> Any:
+        """Returns the result of <query>, reusing the cached result stored
+        under <key> if it is younger than <ttl> seconds.
+
+        Telemetry changes slowly compared to how often the UI polls it, so
+        short-lived caching saves serial round-trips without staling the
+        display.
+        """
+        now = time.monotonic()
+        cached = self._cache.get(key)
+        if cached is not None and now - cached[0] < ttl:
+            return cached[1]
+        value = query()
+        self._cache[key] = (now, value)
+        return value
+
+    def _invalidate(self, *keys: str) -> None:
+        """Drops the cached results of <keys>, or every result if no key is
+        given."""
+        if not keys:
+            self._cache.clear()
+        for key in keys:
+            self._cache.pop(key, None)
 
     def __repr__(self) -> str:
         reprstr = (
@@ -283,6 +742,37 @@ class IpsLaser:
         )
         return reprstr
 
+    def flush_errors(self) -> list[tuple[int, str]]:
+        """Reads the laser error queue until it reports no error.
+
+        Use after unchecked writes (check=False) to collect their errors.
+
+        Returns:
+        <errors> : list of the (err_code, err_msg) read, oldest first. If the
+        serial link fails or a reply cannot be parsed, the reading stops and
+        the last entry is TRANSPORT_ERROR or PARSE_ERROR.
+        """
+        errors = []
+        if not self.isconnected:
+            return errors
+        for _ in range(_MAX_QUEUED_ERRORS):
+            try:
+                with self._mutex:
+                    reply = self._transaction(_ERROR_QUERY)
+                err_code, err_msg = _parse_error(reply)
+            except _TRANSPORT_EXCEPTIONS as e:
+                logger.error(e)
+                errors.append((TRANSPORT_ERROR, ERROR_CODES[TRANSPORT_ERROR]))
+                break
+            except ValueError as e:
+                logger.error(e)
+                errors.append((PARSE_ERROR, ERROR_CODES[PARSE_ERROR]))
+                break
+            if err_code == 0:
+                break
+            errors.append((err_code, err_msg))
+        return errors
+
     ## Getters
 
     def get_id(self) -> tuple[str, int, str]:
@@ -325,8 +815,8 @@ class IpsLaser:
         Returns: <board_current> : measured current draw in mA
         <err_code> : communication error code
         <err_msg> : communication error message"""
-        board_current, err_code, err_msg = self._safe_scpi_query(
-            "Board:Current?"
+        board_current, err_code, err_msg = self._cached(
+            "board_current", lambda: self._safe_scpi_query("Board:Current?")
         )
         board_current = str2float(board_current)
         return board_current, err_code, err_msg
@@ -337,8 +827,9 @@ class IpsLaser:
         Returns: <board_temp> : module case temperature in °C
         <err_code> : communication error code
         <err_msg> : communication error message"""
-        board_temp, err_code, err_msg = self._safe_scpi_query(
-            "Board:Temperature?"
+        board_temp, err_code, err_msg = self._cached(
+            "board_temperature",
+            lambda: self._safe_scpi_query("Board:Temperature?"),
         )
         board_temp = str2float(board_temp)
         return board_temp, err_code, err_msg
@@ -350,6 +841,9 @@ class IpsLaser:
         <err_code> : communication error code
         <err_msg> : communication error message"""
         cal_num, err_code, err_msg = self._safe_scpi_query("Calibrate:Number?")
+        # No answer to convert if the query failed
+        if err_code != 0 and not cal_num:
+            return 0, err_code, err_msg
         cal_num = int(cal_num)
         return cal_num, err_code, err_msg
 
@@ -363,7 +857,7 @@ class IpsLaser:
         <err_msg> : communication error message
         """
         cal_mon, err_code, err_msg = self._safe_scpi_query(
-            "Calibrate:Monitor? " + str(num)
+            f"Calibrate:Monitor? {num}"
         )
         cal_mon = str2float(cal_mon)
         return cal_mon, err_code, err_msg
@@ -378,11 +872,35 @@ class IpsLaser:
         <err_msg> : communication error message
         """
         cal_pow, err_code, err_msg = self._safe_scpi_query(
-            "Calibrate:Power? " + str(num)
+            f"Calibrate:Power? {num}"
         )
         cal_pow = str2float(cal_pow)
         return cal_pow, err_code, err_msg
 
+    def get_calibration_lut(
+        self,
+    ) -> tuple[list[tuple[float, float]], int, str]:
+        """Reports the whole calibration Look Up Table (LUT).
+
+        All the entries are read with a single compound query, after reading
+        the number of entries.
+
+        Returns: <entries> : (PD monitor value in mV, power in mW) of each
+        LUT entry
+        <err_code> : communication error code
+        <err_msg> : communication error message
+        """
+        cal_num, err_code, err_msg = self.get_calibrate_number()
+        if err_code != 0:
+            return [], err_code, err_msg
+        queries = []
+        for num in range(1, cal_num + 1):
+            queries += [f"Calibrate:Monitor? {num}", f"Calibrate:Power? {num}"]
+        answers, err_code, err_msg = self._safe_scpi_compound(tuple(queries))
+        values = [str2float(answer) for answer in answers]
+        entries = list(zip(values[::2], values[1::2]))
+        return entries, err_code, err_msg
+
     def get_laser_current(self) -> tuple[float, int, str]:
         """Reports measured laser operating current in mA.
 
@@ -390,8 +908,8 @@ class IpsLaser:
         <err_code> : communication error code
         <err_msg> : communication error message
         """
-        laser_current, err_code, err_msg = self._safe_scpi_query(
-            "Laser:Current?"
+        laser_current, err_code, err_msg = self._cached(
+            "laser_current", lambda: self._safe_scpi_query("Laser:Current?")
         )
         laser_current = str2float(laser_current)
         return laser_current, err_code, err_msg
@@ -414,7 +932,9 @@ class IpsLaser:
         <err_code> : communication error code
         <err_msg> : communication error message
         """
-        state, err_code, err_msg = self._safe_scpi_query("Laser:Enable?")
+        state, err_code, err_msg = self._cached(
+            "enable", lambda: self._safe_scpi_query("Laser:Enable?")
+        )
         state = bool(int(state))
         return state, err_code, err_msg
 
@@ -473,7 +993,7 @@ class IpsLaser:
         <err_code> : communication error code
         <err_msg> : communication error message
         """
-        scpi_str = f"Laser:Mode:PWM? {int(bool(get_factory))}"
+        scpi_str = f"Laser:Mode:PWM? {'1' if get_factory else '0'}"
         pwm, err_code, err_msg = self._safe_scpi_query(scpi_str)
         pwm = str2float(pwm)
         return pwm, err_code, err_msg
@@ -497,7 +1017,9 @@ class IpsLaser:
         <err_code> : communication error code
         <err_msg> : communication error message
         """
-        laser_power, err_code, err_msg = self._safe_scpi_query("Laser:Power?")
+        laser_power, err_code, err_msg = self._cached(
+            "laser_power", lambda: self._safe_scpi_query("Laser:Power?")
+        )
         laser_power = str2float(laser_power)
         return laser_power, err_code, err_msg
 
@@ -508,8 +1030,9 @@ class IpsLaser:
         <err_code> : communication error code
         <err_msg> : communication error message
         """
-        laser_temp, err_code, err_msg = self._safe_scpi_query(
-            "Laser:Temperature?"
+        laser_temp, err_code, err_msg = self._cached(
+            "laser_temperature",
+            lambda: self._safe_scpi_query("Laser:Temperature?"),
         )
         laser_temp = str2float(laser_temp)
         return laser_temp, err_code, err_msg
@@ -532,9 +1055,7 @@ class IpsLaser:
         <err_code> : communication error code
         <err_msg> : communication error message
         """
-        scpi_str, err_code, err_msg = (
-            f"TEC:SETpoint? {int(bool(factory_setting))}"
-        )
+        scpi_str = f"TEC:SETpoint? {'1' if factory_setting else '0'}"
         setpoint, err_code, err_msg = self._safe_scpi_query(scpi_str)
         setpoint = str2float(setpoint)
         return setpoint, err_code, err_msg
@@ -597,10 +1118,49 @@ class IpsLaser:
         err_code, err_msg = self._safe_scpi_write(scpi_str)
         return err_code, err_msg
 
-    def set_laser_current(self, current: float) -> tuple[int, str]:
+    def set_calibration_lut(
+        self, entries: list[tuple[int, float]], save_state: int = 0
+    ) -> tuple[int, str]:
+        """Loads the whole calibration Look Up Table (LUT) in a single
+        compound command.
+
+        Parameters:
+        <entries> (list[tuple[int, float]]) : (PD monitor value in mV, power in
+        mW) of each LUT entry, from 2 to 9 entries
+        <save_state> (int) : 1 = store permanently, and 0 = use until next power cycle
+        If no value entered for <save state> default is to 0
+
+        Returns:
+        <err_code> : communication error code
+        <err_msg> : communication error message
+        """
+        if not 2 <= len(entries) <= 9:
+            raise ValueError(
+                f"The LUT takes 2 to 9 entries, got {len(entries)}"
+            )
+        commands = [
+            f"Calibrate:Monitor {num} {monitor} {save_state}"
+            for num, (monitor, _) in enumerate(entries, 1)
+        ]
+        commands += [
+            f"Calibrate:Power {num} {power} {save_state}"
+            for num, (_, power) in enumerate(entries, 1)
+        ]
+        commands.append(f"Calibrate:Number {len(entries)} {save_state}")
+        err_code, err_msg = self._safe_scpi_write(
+            _SCPI_SEPARATOR.join(commands)
+        )
+        self._invalidate("laser_power")
+        return err_code, err_msg
+
+    def set_laser_current(
+        self, current: float, check: bool = True
+    ) -> tuple[int, str]:
         """Sets laser operating current setpoint in mA.
 
         Parameter : <current> is the laser operating current in mA
+        Parameter : <check> (bool) : If False, the error is not read back,
+        see flush_errors()
 
         Returns:
         <err_code> : communication error code
@@ -609,7 +1169,8 @@ class IpsLaser:
         current = int(current)
         scpi_str = f"Laser:Current {current}"
         self.target_current = current
-        err_code, err_msg = self._safe_scpi_write(scpi_str)
+        err_code, err_msg = self._safe_scpi_write(scpi_str, check=check)
+        self._invalidate("laser_current", "laser_power", "board_current")
         return err_code, err_msg
 
     def set_enable(self, enable: bool) -> tuple[int, str]:
@@ -621,11 +1182,23 @@ class IpsLaser:
         <err_code> : communication error code
         <err_msg> : communication error message
         """
-        scpi_str = f"Laser:Enable {str(int(bool(enable)))}"
+        scpi_str = f"Laser:Enable {'1' if enable else '0'}"
         err_code, err_msg = self._safe_scpi_write(scpi_str)
-        # Update reference
+        self._invalidate("laser_current", "laser_power", "board_current")
+        # Update reference from the command itself, the state is only read
+        # back from the laser if the command failed
         if err_code == 0:
-            self.isenabled = enable
+            self.isenabled = bool(enable)
+            self._cache["enable"] = (
+                time.monotonic(),
+                (str(int(self.isenabled)), err_code, err_msg),
+            )
+        else:
+            self._invalidate("enable")
+            try:
+                self.isenabled = self.get_enable()[0]
+            except Exception as e:
+                logger.error(e)
         return err_code, err_msg
 
     def set_analog_mode(self, analog_on: bool) -> tuple[int, str]:
@@ -640,7 +1213,7 @@ class IpsLaser:
         <err_code> : communication error code
         <err_msg> : communication error message
         """
-        scpi_str = f"Laser:Mode:Analog {int(bool(analog_on))}"
+        scpi_str = f"Laser:Mode:Analog {'1' if analog_on else '0'}"
         err_code, err_msg = self._safe_scpi_write(scpi_str)
         return err_code, err_msg
 
@@ -654,7 +1227,7 @@ class IpsLaser:
         <err_code> : communication error code
         <err_msg> : communication error message
         """
-        scpi_str = f"Laser:Mode:Digital {int(bool(digital_on))}"
+        scpi_str = f"Laser:Mode:Digital {'1' if digital_on else '0'}"
         err_code, err_msg = self._safe_scpi_write(scpi_str)
         return err_code, err_msg
 
@@ -686,6 +1259,7 @@ class IpsLaser:
         """
         scpi_str = f"TEC:SETpoint {temperature}"
         err_code, err_msg = self._safe_scpi_write(scpi_str)
+        self._invalidate("laser_temperature")
         return err_code, err_msg
 
     # Advanced methods (USE WITH CARE)
@@ -723,57 +1297,290 @@ class IpsLaser:
 
     # Compound methods
 
-    def connect(self) -> bool:
-        """Connects the laser"""
+    def connect(
+        self,
+        idn: str | None = None,
+        *,
+        baud_rate: int = 115200,
+        timeout_ms: int = _TIMEOUT_MS,
+        chunk_size: int = _CHUNK_SIZE,
+        termination: str = "\n",
+    ) -> bool:
+        """Connects the laser.
+
+        A session kept open by soft_disconnect() on the same comport is
+        reused instead of being reopened.
+
+        Parameter : <idn> (str) : identification string of the laser, as
+        returned by find_ips_laser(). When given, get_info() does not query
+        *IDN? again.
+        Parameters : <baud_rate>, <timeout_ms>, <chunk_size> and
+        <termination> configure the serial session.
+        """
+        self.idn = idn
         try:
-            self.pyvisa_serial = self.ressource_manage.open_resource(
-                self.comport
-            )
+            if (
+                self.pyvisa_serial is not None
+                and self.pyvisa_serial.resource_name != self.comport
+            ):
+                self.close()
+            if self.pyvisa_serial is None:
+                self.pyvisa_serial = self.ressource_manage.open_resource(
+                    self.comport
+                )
+                _set_low_latency(self.comport)
+            # Read whole answers in a single chunk and let the explicit
+            # terminations end each transaction as soon as the laser replies
+            self.pyvisa_serial.baud_rate = baud_rate
+            self.pyvisa_serial.chunk_size = chunk_size
+            self.pyvisa_serial.write_termination = termination
+            self.pyvisa_serial.read_termination = termination
+            self.pyvisa_serial.timeout = timeout_ms
+            self._invalidate()
             self.isconnected = True
         except Exception as _:
             self.isconnected = False
 
         return self.isconnected
 
-    def disconnect(self) -> str:
-        """Close the serial connection to the laser,
-        disable laser if enabled."""
+    def soft_disconnect(self) -> bool:
+        """Disable the laser and set its current to 0 mA, but keep the serial
+        session open so that the next connect() does not reopen the port.
+        Use close() or disconnect() to release the port."""
         self.set_laser_current(0)
         self.set_enable(0)
         self.isconnected = False
         self.idn = None
-        self.pyvisa_serial.close()
+        self._invalidate()
+        return not self.isconnected
+
+    def close(self) -> None:
+        """Close the serial session, if any."""
+        self.isconnected = False
+        if self.pyvisa_serial is not None:
+            try:
+                self.pyvisa_serial.close()
+            finally:
+                self.pyvisa_serial = None
+
+    def disconnect(self) -> bool:
+        """Close the serial connection to the laser,
+        disable laser if enabled."""
+        self.soft_disconnect()
+        self.close()
         return not self.isconnected
 
+    def pulse(self, duration_ms: float) -> tuple[int, str]:
+        """Enables the laser for <duration_ms> milliseconds, then disables it.
+
+        Both edges are plain writes without the Error? check, and the wait
+        runs against a deadline taken when the enable command was sent, so
+        the ON time stays close to <duration_ms>. The error queue is read
+        once the laser is disabled again. The serial session is held for the
+        whole pulse.
+
+        Parameter : <duration_ms> (float) : pulse duration in ms
+
+        Returns:
+        <err_code> : communication error code
+        <err_msg> : communication error message
+        """
+        if not self.isconnected:
+            return 0, _NO_ERROR_MSG
+        try:
+            with self._mutex:
+                self.pyvisa_serial.write("Laser:Enable 1")
+                deadline = time.perf_counter() + duration_ms / 1000
+                try:
+                    time.sleep(max(0.0, deadline - time.perf_counter()))
+                finally:
+                    self.pyvisa_serial.write("Laser:Enable 0")
+                reply = self._transaction(_ERROR_QUERY)
+            err_code, err_msg = _parse_error(reply)
+        except _TRANSPORT_EXCEPTIONS as e:
+            logger.error(e)
+            err_code, err_msg = TRANSPORT_ERROR, ERROR_CODES[TRANSPORT_ERROR]
+        except ValueError as e:
+            logger.error(e)
+            err_code, err_msg = PARSE_ERROR, ERROR_CODES[PARSE_ERROR]
+
+        self._invalidate(
+            "enable", "laser_current", "laser_power", "board_current"
+        )
+        self.isenabled = False
+        return err_code, err_msg
+
     def get_info(self) -> None:
+        """Updates self.info with the laser identification and telemetry.
+
+        The telemetry, and the identification if it is not known yet, is
+        read with a single compound query; the individual getters remain
+        available for callers that only need one value.
+        """
         if not self.isconnected:
             self.info = IPSInfo()
+            return
 
         try:
-            _, model, serial_number, wavelength, _ = self.get_id()[0].split(
-                ","
-            )
-            is_enabled = self.get_enable()[0]
-            temperature = self.get_laser_temperature()[0]
-            current = self.get_laser_current()[0]
-            power = self.get_laser_power()[0]
+            queries = _INFO_QUERIES
+            if self.idn is None:
+                queries = ("*IDN?", *_INFO_QUERIES)
+            # The trailing Error? of the compound query doubles as the error
+            # check, no separate error query is needed
+            answers, err_code, err_msg = self._safe_scpi_compound(queries)
+            if self.idn is None:
+                idn = answers.pop(0)
+                # A failed read leaves the IDN unknown, so that the next
+                # call queries it again
+                if not idn or err_code == TRANSPORT_ERROR:
+                    self.info = IPSInfo()
+                    return
+                self.idn = idn
+            # The identification does not change during a session, it is only
+            # parsed again when self.idn is replaced
+            if self._idn_fields is None or self._idn_fields[0] != self.idn:
+                _, model, serial_number, wavelength, _ = self.idn.split(",")
+                self._idn_fields = (
+                    self.idn,
+                    model.strip(),
+                    serial_number.strip(),
+                    float(wavelength),
+                )
+            _, model, serial_number, wavelength = self._idn_fields
+            if err_code != self._last_error:
+                self._last_error = err_code
+                if err_code != 0:
+                    logger.warning(
+                        "get_info: laser error %s, %s", err_code, err_msg
+                    )
+            # Unchanged answers keep the current IPSInfo, without parsing
+            # them again
+            info_key = (self.idn, self.target_current, *answers)
+            if self.info.is_connected and info_key == self._info_key:
+                return
+            state, current, power, temperature = answers
+            is_enabled = bool(int(state))
+            current = str2float(current)
+            power = str2float(power)
+            temperature = str2float(temperature)
             self.info = IPSInfo(
                 is_connected=True,
                 is_enabled=is_enabled,
-                model=model.strip(),
-                serial_number=serial_number.strip(),
-                wavelength=float(wavelength),
+                model=model,
+                serial_number=serial_number,
+                wavelength=wavelength,
                 temperature=temperature,
                 laser_current=current,
                 laser_power=power,
                 laser_target_current=self.target_current,
             )
+            self._info_key = info_key
+        except Exception as _:
+            self.info = IPSInfo()
+
+    def get_fast_status(self) -> None:
+        """Updates only the enable state of self.info, with a single query.
+
+        Cheap enough to be polled faster than get_info(); the telemetry and
+        identification of self.info are left as read by the last get_info(),
+        which is called instead until the laser has been read once.
+        """
+        if not self.isconnected or not self.info.is_connected:
+            self.get_info()
+            return
+
+        # Like get_info, any failure leaves the laser disconnected rather
+        # than raising into the poller
+        try:
+            state, err_code, err_msg = self._safe_scpi_query("Laser:Enable?")
+            is_enabled = bool(int(state))
         except Exception as _:
             self.info = IPSInfo()
+            return
+        if err_code != self._last_error:
+            self._last_error = err_code
+            if err_code != 0:
+                logger.warning(
+                    "get_fast_status: laser error %s, %s", err_code, err_msg
+                )
+        if is_enabled != self.info.is_enabled:
+            self.info = replace(self.info, is_enabled=is_enabled)
+            # self.info no longer matches the last get_info() answers
+            self._info_key = None
+
+
+class AsyncIpsLaser:
+    """asyncio front-end to IpsLaser.
+
+    Every blocking serial transaction runs in a worker thread through
+    asyncio.to_thread, so the event loop keeps running while the laser
+    answers. The wrapped IpsLaser (and its mutex) stays the single owner of
+    the serial session.
+    """
+
+    def __init__(self, laser: IpsLaser | None = None) -> None:
+        self.laser: IpsLaser = laser if laser is not None else IpsLaser()
+
+    @property
+    def info(self) -> IPSInfo:
+        return self.laser.info
+
+    async def find_ips_laser(self, **kwargs) -> dict[str, dict]:
+        """Awaitable IpsLaser.find_ips_laser()"""
+        return await asyncio.to_thread(self.laser.find_ips_laser, **kwargs)
+
+    async def connect(self, *args, **kwargs) -> bool:
+        """Awaitable IpsLaser.connect()"""
+        return await asyncio.to_thread(self.laser.connect, *args, **kwargs)
+
+    async def disconnect(self) -> bool:
+        """Awaitable IpsLaser.disconnect()"""
+        return await asyncio.to_thread(self.laser.disconnect)
+
+    async def get_info(self) -> IPSInfo:
+        """Awaitable IpsLaser.get_info(), returns the refreshed IPSInfo."""
+        await asyncio.to_thread(self.laser.get_info)
+        return self.laser.info
+
+    async def set_laser_current(
+        self, current: float, check: bool = True
+    ) -> tuple[int, str]:
+        """Awaitable IpsLaser.set_laser_current()"""
+        return await asyncio.to_thread(
+            self.laser.set_laser_current, current, check
+        )
+
+    async def set_enable(self, enable: bool) -> tuple[int, str]:
+        """Awaitable IpsLaser.set_enable()"""
+        return await asyncio.to_thread(self.laser.set_enable, enable)
+
+    async def pulse(self, duration_ms: float) -> tuple[int, str]:
+        """Enables the laser for <duration_ms> milliseconds.
+
+        The wait is an asyncio.sleep, so other tasks keep running during the
+        pulse. The laser is disabled even if the pulse task is cancelled.
+
+        Returns:
+        <err_code> : communication error code
+        <err_msg> : communication error message
+        """
+        err_code, err_msg = await self.set_enable(True)
+        if err_code != 0:
+            return err_code, err_msg
+        try:
+            await asyncio.sleep(duration_ms / 1000)
+        finally:
+            err_code, err_msg = await self.set_enable(False)
+        return err_code, err_msg
 
 
 if __name__ == "__main__":
 
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
     logger.info("Creating ips object")
     ips = IpsLaser()
 
@@ -782,8 +1589,9 @@ if __name__ == "__main__":
 
     logger.info("Connected lasers:")
     if available_lasers:
-        for i, laser in enumerate(available_lasers):
-            print("\nAvailable Lasers:")
+        laser_names = list(available_lasers)
+        print("\nAvailable Lasers:")
+        for i, laser in enumerate(laser_names):
             print(f"{i}) ", laser)
         selected_laser = int(
             input(
@@ -791,13 +1599,13 @@ if __name__ == "__main__":
             )
             or 0
         )
-        ips.comport = list(available_lasers)[selected_laser]
+        ips.comport = laser_names[selected_laser]
     else:
         logger.info("\tNo laser found")
-        exit()
+        sys.exit(1)
 
-    logger.info(f"Connecting to laser {ips.comport}")
-    ips.connect()
+    logger.info("Connecting to laser %s", ips.comport)
+    ips.connect(idn=available_lasers[ips.comport]["idn"])
 
     ips.get_info()
     logger.info(ips.info)
@@ -1,14 +1,29 @@
-"""User Interface (UI) for the control of IPS lasers with the IPSLaser() class 
+"""User Interface (UI) for the control of IPS lasers with the IPSLaser() class
 imported from the laser_control module"""
 
 import logging
-import sys
+import math
+import os
+from collections.abc import Callable
 from pathlib import Path
-from time import strftime
-
-import pyqt5_fugueicons as fugue
-from PyQt5.QtCore import QTimer
-from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget
+from threading import Lock
+from time import monotonic, strftime
+from typing import Any
+
+from PyQt5.QtCore import (
+    QEvent,
+    QObject,
+    QRunnable,
+    QSignalBlocker,
+    Qt,
+    QThread,
+    QThreadPool,
+    QTimer,
+    pyqtSignal,
+    pyqtSlot,
+)
+from PyQt5.QtGui import QIcon
+from PyQt5.QtWidgets import QApplication, QLabel, QWidget
 
 from lumed_ips.ips_control import IPSInfo, IpsLaser
 from lumed_ips.ui.ips_ui import Ui_ipsWidget
@@ -16,9 +31,37 @@ from lumed_ips.ui.ips_ui import Ui_ipsWidget
 logger = logging.getLogger(__name__)
 
 LOGS_DIR = Path.home() / "logs/IPS"
-LOG_PATH = LOGS_DIR / f"{strftime('%Y_%m_%d_%H_%M_%S')}.log"
 
-LASER_STATE = {0: "Idle", 1: "ON", 2: "Not connected"}
+LASER_STATE = ("Idle", "ON", "Not connected")
+# Enable state names in the logs, indexed by the enable state
+ENABLE_STATE = ("Disabled", "Enabled")
+
+# Status label colors, selected by the label "state" property
+CONNECTED_LABEL_STYLE = (
+    'QLabel[state="true"] { color: green; }'
+    'QLabel[state="false"] { color: red; }'
+)
+ENABLED_LABEL_STYLE = (
+    'QLabel[state="true"] { color: orange; }'
+    'QLabel[state="false"] { color: green; }'
+)
+SAFETY_TRIP_LABEL_STYLE = "QLabel { color: red; font-weight: bold; }"
+
+# DEBUG logging is opt-in, set LUMED_IPS_DEBUG=1 to enable it
+LOG_LEVEL = (
+    logging.DEBUG if os.environ.get("LUMED_IPS_DEBUG") == "1" else logging.INFO
+)
+
+# Laser polling periods, fast while the laser is enabled or its infos change
+ACTIVE_POLL_INTERVAL_MS = 100
+IDLE_POLL_INTERVAL_MS = 2000
+# Shortest period between two telemetry reads, the polls in between only
+# read the enable state
+TELEMETRY_POLL_INTERVAL_MS = 500
+# Delay after the last spinbox edit before the current is written
+CURRENT_DEBOUNCE_MS = 150
+# Unchanged polls before an idle laser is polled at the idle period
+STABLE_POLLS_BEFORE_BACKOFF = 50
 
 LOG_FORMAT = (
     "%(asctime)s - %(levelname)s"
@@ -26,35 +69,258 @@ LOG_FORMAT = (
     "(%(filename)s:%(lineno)d) - "
     "%(message)s"
 )
+_FORMATTER = logging.Formatter(LOG_FORMAT)
 
+_ICON_CACHE: dict[str, QIcon] = {}
 
-def configure_logger():
-    """Configures the logger if lumed_ips is launched as a module"""
 
-    if not LOGS_DIR.parent.exists():
-        LOGS_DIR.parent.mkdir()
-    if not LOGS_DIR.exists():
-        LOGS_DIR.mkdir()
+def _icon(name: str) -> QIcon:
+    """Returns the fugue icon <name>, loaded once. The icon package is only
+    imported when the first icon is needed."""
+    icon = _ICON_CACHE.get(name)
+    if icon is None:
+        import pyqt5_fugueicons as fugue
+
+        icon = _ICON_CACHE[name] = fugue.icon(name)
+    return icon
 
-    formatter = logging.Formatter(LOG_FORMAT)
+
+def configure_logger():
+    """Configures the lumed_ips logger if lumed_ips is launched as a module.
+    Does nothing if the logger already has handlers."""
+    package_logger = logging.getLogger("lumed_ips")
+    if package_logger.handlers:
+        return
+
+    LOGS_DIR.mkdir(parents=True, exist_ok=True)
+    # Named after the launch time, not the import time
+    log_path = LOGS_DIR / f"{strftime('%Y_%m_%d_%H_%M_%S')}.log"
 
     terminal_handler = logging.StreamHandler()
-    terminal_handler.setFormatter(formatter)
-    file_handler = logging.FileHandler(LOG_PATH)
-    file_handler.setFormatter(formatter)
+    terminal_handler.setFormatter(_FORMATTER)
+    file_handler = logging.FileHandler(log_path)
+    file_handler.setFormatter(_FORMATTER)
+
+    package_logger.addHandler(terminal_handler)
+    package_logger.addHandler(file_handler)
+    package_logger.setLevel(LOG_LEVEL)
+
+
+class LaserPoller(QObject):
+    """Reads the laser infos. Lives in a worker thread, along with its poll
+    timer, so that neither the serial round-trips of get_info nor the
+    timer ticks involve the GUI thread.
+
+    The timer ticks only read the enable state, the telemetry is read at
+    most every TELEMETRY_POLL_INTERVAL_MS.
+
+    Enable and current requests are not written at once: only the latest
+    request of each is kept, and written on the next poll if it differs
+    from the laser state. Clicking faster than the laser answers thus never
+    queues up serial writes. A pulse request is written as a whole by
+    IpsLaser.pulse, before the enable request that followed it, if any.
+
+    info_ready carries, with the laser infos, the id of the last enable
+    request they reflect (see request_enable)."""
+
+    info_ready = pyqtSignal(object, int)
+    disconnected = pyqtSignal()
+
+    def __init__(self, laser: IpsLaser):
+        super().__init__()
+        self.laser = laser
+        self._last_telemetry: float = -math.inf
+        self._pending_enable: bool | None = None
+        self._pending_pulse_ms: int | None = None
+        self._pending_current: int | None = None
+        self._pending_lock = Lock()
+        self._enable_request_id: int = 0
+        self._applied_enable_id: int = 0
+        self._poll_queued: bool = False
+        # Child of the poller, moves to the worker thread with it
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setInterval(IDLE_POLL_INTERVAL_MS)
+        self.timer.timeout.connect(self.tick)
+
+    # Called from the GUI thread, so that a poll already queued in the
+    # worker thread writes the latest request
+    def request_enable(self, enable: bool) -> int:
+        """Returns: <request_id> : id of the request, increasing"""
+        with self._pending_lock:
+            self._pending_enable = enable
+            self._enable_request_id += 1
+            return self._enable_request_id
+
+    def request_pulse(self, duration_ms: int) -> int:
+        """Returns: <request_id> : id of the request, shared with the
+        enable requests, as the laser ends the pulse disabled"""
+        with self._pending_lock:
+            # The pulse overrides the earlier enable request
+            self._pending_enable = None
+            self._pending_pulse_ms = duration_ms
+            self._enable_request_id += 1
+            return self._enable_request_id
+
+    def request_current(self, current: int):
+        with self._pending_lock:
+            self._pending_current = current
+
+    def clear_requests(self):
+        """Drops the pending requests, none is written afterwards."""
+        with self._pending_lock:
+            self._pending_enable = None
+            self._pending_pulse_ms = None
+            self._pending_current = None
+
+    def request_poll(self) -> bool:
+        """Returns: <queue_poll> : False if a poll is already queued, it
+        will write the pending requests"""
+        with self._pending_lock:
+            queue_poll = not self._poll_queued
+            self._poll_queued = True
+            return queue_poll
+
+    def _write_pending(self) -> bool:
+        """Writes the pending requests that differ from the laser state.
+
+        Returns: <written> : True if a command was written
+        """
+        written = False
+        with self._pending_lock:
+            self._poll_queued = False
+            enable, self._pending_enable = self._pending_enable, None
+            pulse_ms, self._pending_pulse_ms = self._pending_pulse_ms, None
+            current, self._pending_current = self._pending_current, None
+            # Read back by the get_info() following this call
+            self._applied_enable_id = self._enable_request_id
+        is_enabled = self.laser.info.is_enabled
+        if pulse_ms is not None:
+            err_code, err_msg = self.laser.pulse(pulse_ms)
+            if err_code != 0:
+                logger.error("Laser pulse failed : %s, %s", err_code, err_msg)
+            is_enabled = False
+            written = True
+        if enable is not None and enable != is_enabled:
+            self.laser.set_enable(enable)
+            written = True
+        if current is not None and current != self.laser.target_current:
+            logger.debug("Setting laser current : %s", current)
+            self.laser.set_laser_current(current)
+            written = True
+        return written
+
+    @pyqtSlot()
+    def poll(self):
+        """Writes the pending requests, then reads all the laser infos."""
+        self._write_pending()
+        self.laser.get_info()
+        self._last_telemetry = monotonic()
+        self.info_ready.emit(self.laser.info, self._applied_enable_id)
+
+    @pyqtSlot()
+    def tick(self):
+        elapsed_ms = (monotonic() - self._last_telemetry) * 1000
+        if self._write_pending() or elapsed_ms >= TELEMETRY_POLL_INTERVAL_MS:
+            self.poll()
+            return
+        self.laser.get_fast_status()
+        self.info_ready.emit(self.laser.info, self._applied_enable_id)
+
+    @pyqtSlot()
+    def start(self):
+        self.timer.start()
+
+    @pyqtSlot()
+    def stop(self):
+        self.timer.stop()
+
+    @pyqtSlot(int)
+    def set_interval(self, interval_ms: int):
+        self.timer.setInterval(interval_ms)
+
+    @pyqtSlot()
+    def soft_disconnect(self):
+        """Stops polling and soft disconnects the laser. Run in the worker
+        thread, no poll can write a request after the laser is disabled."""
+        self.timer.stop()
+        self.clear_requests()
+        self.laser.soft_disconnect()
+        self.disconnected.emit()
+
 
-    logger.addHandler(terminal_handler)
-    logger.addHandler(file_handler)
-    logger.setLevel(logging.DEBUG)
+def _finish_thread(thread: QThread) -> None:
+    """Stops the event loop of <thread> and waits for it to return."""
+    thread.quit()
+    thread.wait()
+
+
+class EnumWorkerSignals(QObject):
+    finished = pyqtSignal(dict)
+
+
+class EnumWorker(QRunnable):
+    """Looks for connected lasers in a QThreadPool thread and emits the found
+    lasers through signals.finished."""
+
+    def __init__(self, laser: IpsLaser):
+        super().__init__()
+        self.laser = laser
+        self.signals = EnumWorkerSignals()
+
+    def run(self):
+        lasers = {}
+        try:
+            # An explicit search always rescans the ports
+            lasers = self.laser.find_ips_laser(force=True)
+        except Exception as e:
+            logger.error(e, exc_info=True)
+        self.signals.finished.emit(lasers)
+
+
+class LaserTaskSignals(QObject):
+    finished = pyqtSignal(object)
+
+
+class LaserTask(QRunnable):
+    """Runs a blocking laser call in a QThreadPool thread and emits its
+    result, or None if it raised, through signals.finished."""
+
+    def __init__(self, task: Callable[[], Any]):
+        super().__init__()
+        self.task = task
+        self.signals = LaserTaskSignals()
+
+    def run(self):
+        result = None
+        try:
+            result = self.task()
+        except Exception as e:
+            logger.error(e, exc_info=True)
+        self.signals.finished.emit(result)
 
 
 class IpsLaserWidget(QWidget, Ui_ipsWidget):
     """User Interface for IPS laser control.
     Subclass IpsLaserWidget to customize the Ui_LaserControl widget"""
 
-    def __init__(self, parent=None):
+    # Emitted with the new IPSInfo whenever the polled laser state changes
+    info_changed = pyqtSignal(object)
+    # Asks the poller thread for an immediate poll
+    poll_requested = pyqtSignal()
+    # Start, stop and set the period of the poller thread timer
+    polling_started = pyqtSignal()
+    polling_stopped = pyqtSignal()
+    poll_interval_changed = pyqtSignal(int)
+    # Asks the poller thread to soft disconnect the laser
+    disconnect_requested = pyqtSignal()
+
+    def __init__(self, parent=None, poll_ms: int = ACTIVE_POLL_INTERVAL_MS):
         super().__init__(parent)
         self.setupUi(self)
+        # Polling period while the laser is enabled, may be raised on
+        # slow links
+        self.poll_ms: int = poll_ms
 
         # logger
         logger.info("Widget intialization")
@@ -62,7 +328,27 @@ class IpsLaserWidget(QWidget, Ui_ipsWidget):
         self.laser: IpsLaser = IpsLaser()
         self.laser.get_info()
         self.laser_info: IPSInfo = self.laser.info
+        self.available_lasers: dict[str, dict] = {}
+        # Ports of available_lasers, in the combobox order
+        self._port_keys: tuple[str, ...] = ()
+        self.enum_worker: EnumWorker | None = None
+        # Connecting runs in the thread pool as well, so its serial
+        # round-trips never block the GUI thread
+        self.laser_task: LaserTask | None = None
+        # Laser infos currently displayed, None until the first update
+        self.shown_info: IPSInfo | None = None
+        # Text currently displayed for each laser info field
+        self._shown_texts: dict[str, str] = {}
         self.last_enabled_state: bool = False
+        # The enable label and buttons follow a request at once, before the
+        # laser has applied it; the first infos read after the request
+        # confirm it or roll the label back
+        self._enable_request_id: int = 0
+        self._applied_enable_id: int = 0
+        self._enable_unverified: bool = False
+        self._shown_enabled: bool | None = None
+        # Consecutive polls that returned unchanged laser infos
+        self._stable_polls: int = 0
 
         # ui parameters
         self.setup_default_ui()
@@ -72,11 +358,29 @@ class IpsLaserWidget(QWidget, Ui_ipsWidget):
         logger.info("Widget initialization complete")
 
     def setup_default_ui(self):
-        self.pushbtnFindLaser.setIcon(fugue.icon("magnifier-left"))
+        # Laser info displayed by each text edit
+        self.info_textedits = (
+            (self.texteditModel, "model"),
+            (self.texteditSN, "serial_number"),
+            (self.texteditWavelength, "wavelength"),
+            (self.texteditCurrent, "laser_current"),
+            (self.texteditPower, "laser_power"),
+            (self.texteditTemperature, "temperature"),
+        )
+
+        self.pushbtnFindLaser.setIcon(_icon("magnifier-left"))
         self.spinboxLaserCurrent.setMaximum(1500)  # max current of IPS lasers
-
-        self.spinboxPulseDuration.setEnabled(False)
-        self.pushbtnPulse.setEnabled(False)
+        # Spinbox values, kept up to date by their valueChanged slots
+        self._current_setpoint: int = self.spinboxLaserCurrent.value()
+        self._pulse_duration_ms: int = self.spinboxPulseDuration.value()
+
+        # Status colors are selected by the labels "state" property
+        self.labelLaserConnected.setStyleSheet(CONNECTED_LABEL_STYLE)
+        self.labelLaserEnabled.setStyleSheet(ENABLED_LABEL_STYLE)
+        # Shown from a safety trip until the user enables or disables the
+        # laser again
+        self.labelSafetyTrip.setStyleSheet(SAFETY_TRIP_LABEL_STYLE)
+        self.labelSafetyTrip.hide()
 
     def connect_ui_signals(self):
         self.pushbtnFindLaser.clicked.connect(self.find_laser)
@@ -84,158 +388,362 @@ class IpsLaserWidget(QWidget, Ui_ipsWidget):
         self.pushbtnDisconnect.clicked.connect(self.disconnect_laser)
         self.pushbtnLaserEnable.clicked.connect(self.enable_laser)
         self.pushbtnLaserDisable.clicked.connect(self.disable_laser)
-        self.spinboxLaserCurrent.valueChanged.connect(self.set_laser_current)
+        self.pushbtnPulse.clicked.connect(self.pulse_laser)
+
+        # Spinbox edits are debounced into a single current write
+        self._current_debounce = QTimer(self)
+        self._current_debounce.setSingleShot(True)
+        self._current_debounce.setInterval(CURRENT_DEBOUNCE_MS)
+        self._current_debounce.timeout.connect(self.set_laser_current)
+        self.spinboxLaserCurrent.valueChanged.connect(self._on_current_changed)
+        self.spinboxPulseDuration.valueChanged.connect(
+            self._on_pulse_duration_changed
+        )
+
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.release_laser)
 
     def find_laser(self):
         logger.info("Looking for connected lasers")
         self.pushbtnFindLaser.setEnabled(False)
-        self.pushbtnFindLaser.setIcon(fugue.icon("hourglass"))
-        self.repaint()
-
-        try:
-            lasers = self.laser.find_ips_laser()
-            logger.info("Found lasers : %s", lasers)
-            self.comboboxAvailableLaser.clear()
-            for laser in lasers:
-                self.comboboxAvailableLaser.addItem(laser)
-        except Exception as e:
-            logger.error(e, exc_info=True)
+        self.pushbtnFindLaser.setIcon(_icon("hourglass"))
+        # Port probing runs in the thread pool, the results come back through
+        # the worker's finished signal
+        self.enum_worker = EnumWorker(self.laser)
+        self.enum_worker.signals.finished.connect(self._populate_combobox)
+        QThreadPool.globalInstance().start(self.enum_worker)
+
+    def _populate_combobox(self, lasers: dict):
+        logger.info("Found lasers : %s", lasers)
+        # Only rebuild the combobox if the enumeration found other lasers
+        if lasers != self.available_lasers:
+            self.available_lasers = lasers
+            self._port_keys = tuple(lasers)
+
+            # Repopulate in one model update, without intermediate repaints
+            # or currentIndexChanged emissions
+            combobox = self.comboboxAvailableLaser
+            combobox.setUpdatesEnabled(False)
+            with QSignalBlocker(combobox):
+                combobox.clear()
+                combobox.addItems(self._port_keys)
+            combobox.setUpdatesEnabled(True)
+        self.enum_worker = None
         self.pushbtnFindLaser.setEnabled(True)
-        self.pushbtnFindLaser.setIcon(fugue.icon("magnifier-left"))
+        self.pushbtnFindLaser.setIcon(_icon("magnifier-left"))
         self.update_ui()
 
     def connect_laser(self):
         logger.info("Connecting laser")
+        index = self.comboboxAvailableLaser.currentIndex()
+        if not 0 <= index < len(self._port_keys):
+            logger.warning("No laser selected")
+            return
+
         self.pushbtnConnect.setEnabled(False)
-        try:
-            laser_comport = self.comboboxAvailableLaser.currentText()
-            self.laser.comport = laser_comport
-            self.laser.connect()
+        laser_comport = self._port_keys[index]
+        self.laser.comport = laser_comport
+        # Reuse the IDN read while probing instead of querying it again
+        laser_idn = self.available_lasers[laser_comport].get("idn")
+
+        def connect_task() -> bool:
+            self.laser.connect(idn=laser_idn)
             if self.laser.isconnected:
                 logger.info("Connected laser : %s", laser_comport)
                 self.set_initial_configurations()
             else:
                 logger.warning("Failed to connect laser")
-        except Exception as e:
-            logger.error(e, exc_info=True)
+            return self.laser.isconnected
 
-        if self.laser.isconnected:
+        self._start_laser_task(connect_task, self._on_laser_connected)
+
+    def _on_laser_connected(self, is_connected: bool | None):
+        self.laser_task = None
+        if is_connected:
+            self.poll_laser_info()
+            self.start_polling()
+        else:
             self.update_ui()
-            self.update_timer.start()
 
     def disconnect_laser(self):
         logger.info("Disconnecting laser")
         self.pushbtnDisconnect.setEnabled(False)
+        self.stop_polling()
+        # soft_disconnect disables the laser and zeroes its current. The
+        # serial session is kept open so reconnecting is immediate. It runs
+        # in the poller thread, after any poll in progress, and the pending
+        # requests are dropped first so that none is written after it
+        self.poller.clear_requests()
+        self.disconnect_requested.emit()
+
+    def _on_laser_disconnected(self):
+        self.poll_laser_info()
+
+    def _start_laser_task(self, task: Callable[[], Any], on_finished):
+        self.laser_task = LaserTask(task)
+        self.laser_task.signals.finished.connect(on_finished)
+        QThreadPool.globalInstance().start(self.laser_task)
+
+    def release_laser(self):
+        """Disables the laser and releases its serial port when the
+        application quits."""
+        logger.info("Releasing laser")
+        self.stop_polling()
+        _finish_thread(self.poll_thread)
         try:
-            self.set_initial_configurations()
-            self.laser.disconnect()
-            self.update_ui()
-            self.update_timer.stop()
+            if self.laser.isconnected:
+                self.laser.disconnect()
+            else:
+                self.laser.close()
         except Exception as e:
             logger.error(e, exc_info=True)
 
     def enable_laser(self):
         logger.info("Enabling laser")
-        self.laser.set_enable(True)
-        self.last_enabled_state = True
-        self.update_ui()
+        self._request_enable(True)
 
     def disable_laser(self):
         logger.info("Disabling laser")
-        self.laser.set_enable(False)
+        self._request_enable(False)
+
+    def _request_enable(self, enable: bool):
+        self._enable_request_id = self.poller.request_enable(enable)
+        self._enable_unverified = True
+        self.last_enabled_state = enable
+        # An explicit request re-arms the laser after a safety trip
+        self.labelSafetyTrip.hide()
+        self._show_enabled(enable)
+        self.poll_laser_info()
+
+    def pulse_laser(self):
+        """Enables the laser for the duration of the pulse spinbox. The
+        pulse is timed by IpsLaser.pulse in the poller thread, from the
+        enable write, leaving the event loop free during the pulse."""
+        duration_ms = self._pulse_duration_ms
+        logger.info("Pulsing laser : %s ms", duration_ms)
+        self._enable_request_id = self.poller.request_pulse(duration_ms)
+        self._enable_unverified = True
+        # The laser is disabled again once the pulse is over
         self.last_enabled_state = False
-        self.update_ui()
+        self.labelSafetyTrip.hide()
+        self._show_enabled(True)
+        self.poll_laser_info()
+
+    def _on_current_changed(self, value: int):
+        self._current_setpoint = value
+        self._current_debounce.start()
+
+    def _on_pulse_duration_changed(self, value: int):
+        self._pulse_duration_ms = value
 
     def set_laser_current(self):
-        laser_current = self.spinboxLaserCurrent.value()
-        logger.info("Setting laser current : %s", laser_current)
-        self.laser.set_laser_current(laser_current)
+        # The poller only writes the setpoint if it differs from the laser
+        # target current, the spinbox sync does not echo it back
+        self.poller.request_current(self._current_setpoint)
+        if self.laser.isconnected:
+            self.poll_laser_info()
 
     def set_initial_configurations(self):
-        logger.info("Setting initial laser configurations")
-        logger.info("Setting laser to disable")
+        logger.info(
+            "Setting initial laser configurations : disabled, current 1 mA"
+        )
         self.laser.set_enable(False)
-        logger.info("Setting laser current to 0 mA")
         self.laser.set_laser_current(1)
 
     def setup_update_timer(self):
-        """Creates the PyQt Timer and connects it to the function that updates
-        the UI and gets the laser infos."""
-        self.update_timer = QTimer()
-        self.update_timer.setInterval(100)
-        self.update_timer.timeout.connect(self.update_ui)
+        """Starts the LaserPoller worker thread, which polls the laser infos
+        on its own timer. The UI is only updated when the polled infos
+        change."""
+        self.poll_thread = QThread(self)
+        self.poller = LaserPoller(self.laser)
+        self.poller.moveToThread(self.poll_thread)
+        self.poller.info_ready.connect(self._apply_info)
+        self.poll_requested.connect(self.poller.poll)
+        self.polling_started.connect(self.poller.start)
+        self.polling_stopped.connect(self.poller.stop)
+        self.poll_interval_changed.connect(self.poller.set_interval)
+        self.disconnect_requested.connect(self.poller.soft_disconnect)
+        self.poller.disconnected.connect(self._on_laser_disconnected)
+        # The timer must be stopped from its own thread
+        self.poll_thread.finished.connect(self.poller.stop)
+        # release_laser only runs when the application quits, a widget
+        # deleted before must still stop the thread it owns. The slot must
+        # not use self, which is being destroyed
+        poll_thread = self.poll_thread
+        self.destroyed.connect(lambda: _finish_thread(poll_thread))
+        self.is_polling: bool = False
+        self._poll_interval: int = IDLE_POLL_INTERVAL_MS
+        self.info_changed.connect(self.update_ui)
+
+        self.poll_thread.start()
+
+    def start_polling(self):
+        self.is_polling = True
+        self.polling_started.emit()
+
+    def stop_polling(self):
+        self.is_polling = False
+        self.polling_stopped.emit()
+
+    def _set_poll_interval(self, interval_ms: int):
+        if interval_ms != self._poll_interval:
+            self._poll_interval = interval_ms
+            self.poll_interval_changed.emit(interval_ms)
+
+    def hideEvent(self, event):
+        """Pauses polling while the widget is hidden."""
+        self.stop_polling()
+        super().hideEvent(event)
+
+    def showEvent(self, event):
+        """Resumes polling of a connected laser when the widget is shown."""
+        super().showEvent(event)
+        if self.laser.isconnected and not self.is_polling:
+            self.poll_laser_info()
+            self.start_polling()
+
+    def changeEvent(self, event):
+        """Pauses polling while the widget's window is minimized."""
+        super().changeEvent(event)
+        if event.type() != QEvent.WindowStateChange:
+            return
+        if self.isMinimized():
+            self.stop_polling()
+        elif self.laser.isconnected and not self.is_polling:
+            self.poll_laser_info()
+            self.start_polling()
+
+    def poll_laser_info(self):
+        """Requests a poll of the laser infos, e.g. right after a user action
+        to refresh the UI at once. Polling stays fast until the laser infos
+        settle."""
+        self._stable_polls = 0
+        self._set_poll_interval(self.poll_ms)
+        if self.poller.request_poll():
+            self.poll_requested.emit()
+
+    def _apply_info(self, laser_info: IPSInfo, applied_enable_id: int):
+        """Receives the polled laser infos in the GUI thread and emits
+        info_changed if they changed. An idle laser whose infos stay
+        unchanged is polled at the idle period."""
+        self._applied_enable_id = applied_enable_id
+        if laser_info == self.laser_info:
+            self._stable_polls += 1
+            if (
+                self._stable_polls == STABLE_POLLS_BEFORE_BACKOFF
+                and not laser_info.is_enabled
+            ):
+                self._set_poll_interval(IDLE_POLL_INTERVAL_MS)
+            if self._enable_unverified and self._enable_applied():
+                # Unchanged infos after a request the laser did not follow
+                self.updateLaserInfo()
+            return
+
+        self._stable_polls = 0
+        self.laser_info = laser_info
+        self._set_poll_interval(self.poll_ms)
+        self.info_changed.emit(laser_info)
+
+    @staticmethod
+    def _set_label_state(label: QLabel, state: bool, text: str) -> None:
+        """Sets the label text and its "state" property, then repolishes it
+        so that its static stylesheet picks the matching color."""
+        label.setText(text)
+        label.setProperty("state", state)
+        label.style().unpolish(label)
+        label.style().polish(label)
 
     def setLabelConnected(self, isconnected: bool) -> None:
-        if isconnected:
-            self.labelLaserConnected.setText("Connected")
-            self.labelLaserConnected.setStyleSheet("color:green")
-        else:
-            self.labelLaserConnected.setText("Not Connected")
-            self.labelLaserConnected.setStyleSheet("color:red")
+        self._set_label_state(
+            self.labelLaserConnected,
+            isconnected,
+            "Connected" if isconnected else "Not Connected",
+        )
+
+    def _enable_applied(self) -> bool:
+        return self._applied_enable_id >= self._enable_request_id
+
+    def _show_enabled(self, is_enabled: bool) -> None:
+        if is_enabled != self._shown_enabled:
+            self.setLabelEnabled(is_enabled)
+            self._shown_enabled = is_enabled
+        self.pushbtnLaserEnable.setEnabled(not is_enabled)
 
     def setLabelEnabled(self, isenabled: bool) -> None:
-        if isenabled:
-            self.labelLaserEnabled.setText("ENABLED")
-            self.labelLaserEnabled.setStyleSheet("color:orange")
-        else:
-            self.labelLaserEnabled.setText("Disabled")
-            self.labelLaserEnabled.setStyleSheet("color:green")
+        self._set_label_state(
+            self.labelLaserEnabled,
+            isenabled,
+            "ENABLED" if isenabled else "Disabled",
+        )
 
     def update_ui(self):
         self.updateLaserInfo()
 
+        laser_info = self.laser_info
         # Enable/disable controls if laser is connected or not
-        is_connected = self.laser_info.is_connected
+        is_connected = laser_info.is_connected
         self.pushbtnConnect.setEnabled(not is_connected)
         self.comboboxAvailableLaser.setEnabled(not is_connected)
         self.pushbtnFindLaser.setEnabled(not is_connected)
         self.pushbtnDisconnect.setEnabled(is_connected)
         self.groupboxControl.setEnabled(is_connected)
-        self.setLabelConnected(is_connected)
-
-        self.pushbtnLaserEnable.setEnabled(not self.laser_info.is_enabled)
+        if (
+            self.shown_info is None
+            or is_connected != self.shown_info.is_connected
+        ):
+            self.setLabelConnected(is_connected)
 
         if not self.spinboxLaserCurrent.hasFocus():
-            self.spinboxLaserCurrent.setValue(self.laser.target_current)
+            # Programmatic sync, must not schedule a current write
+            self._current_setpoint = self.laser.target_current
+            with QSignalBlocker(self.spinboxLaserCurrent):
+                self.spinboxLaserCurrent.setValue(self._current_setpoint)
+
+        self.shown_info = laser_info
 
     def laser_safety_check(self):
+        if not self._enable_applied():
+            # The infos predate the last enable request
+            return
         is_enabled = self.laser_info.is_enabled
+        unverified, self._enable_unverified = self._enable_unverified, False
         if is_enabled != self.last_enabled_state:
-            logger.warning(
-                "Laser safety trip setting laser to %s",
-                ["Disabled", "Enabled"][is_enabled],
-            )
-            self.laser.set_enable(is_enabled)
+            if unverified:
+                logger.error(
+                    "Laser did not apply the enable request, laser is %s",
+                    ENABLE_STATE[is_enabled],
+                )
+            else:
+                logger.warning(
+                    "Laser safety trip, laser is %s",
+                    ENABLE_STATE[is_enabled],
+                )
+                self.labelSafetyTrip.setText(
+                    f"Safety trip: laser {ENABLE_STATE[is_enabled].lower()}"
+                )
+                self.labelSafetyTrip.show()
+            # Only reconciled: the laser already is in this state, and
+            # writing it back would hide the trip and could override a
+            # pending user request
             self.last_enabled_state = is_enabled
 
     def updateLaserInfo(self):
-
-        self.laser.get_info()
-        self.laser_info = self.laser.info
-
-        if self.laser_info.is_connected:
+        laser_info = self.laser_info
+        if laser_info.is_connected:
             self.laser_safety_check()
 
-        # update UI based on laserinfo
-        self.setLabelEnabled(self.laser_info.is_enabled)
-        self.texteditModel.setPlainText(self.laser_info.model)
-        self.texteditSN.setPlainText(self.laser_info.serial_number)
-        self.texteditWavelength.setPlainText(str(self.laser_info.wavelength))
-        self.texteditCurrent.setPlainText(str(self.laser_info.laser_current))
-        self.texteditPower.setPlainText(str(self.laser_info.laser_power))
-        self.texteditTemperature.setPlainText(str(self.laser_info.temperature))
-
-
-if __name__ == "__main__":
-
-    # Set up logging
-    configure_logger()
-
-    # Create app window
-    app = QApplication(sys.argv)
-    window = QMainWindow()
-    window.show()
-
-    window.setCentralWidget(IpsLaserWidget())
-
-    app.exec_()
+        # update UI based on laserinfo, only touching the widgets whose
+        # value changed since the last update. Until the laser infos reflect
+        # the last enable request, the requested state stays shown
+        if self._enable_applied():
+            self._show_enabled(laser_info.is_enabled)
+        else:
+            self._show_enabled(self.last_enabled_state)
+
+        # Compared as text, NaN readings never compare equal as floats
+        for textedit, field in self.info_textedits:
+            text = str(getattr(laser_info, field))
+            if text != self._shown_texts.get(field):
+                textedit.setPlainText(text)
+                self._shown_texts[field] = text
@@ -210,6 +210,10 @@ class Ui_ipsWidget(object):
         self.labelLaserEnabled.setText("")
         self.labelLaserEnabled.setObjectName("labelLaserEnabled")
         self.verticalLayout_4.addWidget(self.labelLaserEnabled)
+        self.labelSafetyTrip = QtWidgets.QLabel(self.groupBox)
+        self.labelSafetyTrip.setText("")
+        self.labelSafetyTrip.setObjectName("labelSafetyTrip")
+        self.verticalLayout_4.addWidget(self.labelSafetyTrip)
         self.horizontalLayout_2.addWidget(self.groupBox)
         self.verticalLayout_2.addLayout(self.horizontalLayout_2)
         self.groupboxInfo = QtWidgets.QGroupBox(ipsWidget)
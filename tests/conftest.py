@@ -0,0 +1,27 @@
+"""Shared fixtures of the lumed_ips tests."""
+
+import logging
+
+import pytest
+
+from lumed_ips.ips_control import IpsLaser
+
+log = logging.getLogger(__name__)
+
+
+@pytest.fixture(scope="session")
+def discovered_laser() -> dict:
+    """Lasers found by find_ips_laser(), scanned once per test session.
+
+    Skips the requesting test if no IPS laser is connected.
+    """
+    log.info("Discovering IPS laser instruments via find_ips_laser() ...")
+    found = IpsLaser().find_ips_laser()
+    if not found:
+        pytest.skip("No IPS laser found. Plug it in and re-run this test.")
+
+    log.info("Found %d candidate resource(s):", len(found))
+    for name, meta in found.items():
+        idn = (meta.get("idn") or "<no idn>").strip()
+        log.info("  - %s (IDN: %s)", name, idn)
+    return found
@@ -0,0 +1,392 @@
+"""
+Unit tests for the IPS laser controller, without hardware.
+
+The serial session is replaced by a minimal fake that answers the compound
+``<query>;Error?`` messages sent by `IpsLaser`.
+"""
+
+import math
+from types import SimpleNamespace
+
+import pytest
+from pyvisa.constants import StatusCode
+from pyvisa.errors import VisaIOError
+from serial import SerialException
+
+from lumed_ips import ips_control
+from lumed_ips.ips_control import (
+    PARSE_ERROR,
+    TRANSPORT_ERROR,
+    IPSInfo,
+    IpsLaser,
+    str2float,
+)
+
+
+class FakeSession:
+    """Answers queries from a table, the error query always reports 0."""
+
+    chunk_size = 65536
+    resource_name = "ASRL/dev/ttyACM0::INSTR"
+
+    def __init__(self, answers: dict[str, str]):
+        self.answers = answers
+        self.written: list[str] = []
+        self._reply = b""
+        self.closed = False
+
+    def write(self, message: str) -> None:
+        self.written.append(message)
+        parts = [
+            '0,"NO_ERROR"' if part == "Error?" else self.answers[part]
+            for part in message.split(";")
+            # Commands, unlike queries, have no answer
+            if "?" in part
+        ]
+        self._reply = (";".join(parts) + "\r\n").encode("ascii")
+
+    def read_bytes(self, count: int, break_on_termchar: bool = False) -> bytes:
+        reply, self._reply = self._reply, b""
+        return reply
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def laser():
+    laser = IpsLaser()
+    laser.pyvisa_serial = FakeSession(
+        {"TEC:SETpoint? 0": "30.0", "TEC:SETpoint? 1": "25.5 C"}
+    )
+    laser.isconnected = True
+    return laser
+
+
+@pytest.mark.parametrize(
+    "factory_setting, expected", [(False, 30.0), (True, 25.5)]
+)
+def test_get_tec_setpoint(laser, factory_setting, expected):
+    setpoint, err_code, _ = laser.get_tec_setpoint(factory_setting)
+    assert setpoint == expected
+    assert err_code == 0
+    assert laser.pyvisa_serial.written == [
+        f"TEC:SETpoint? {int(factory_setting)};Error?"
+    ]
+
+
+def test_get_calibration_lut(laser):
+    laser.pyvisa_serial.answers = {
+        "Calibrate:Number?": "2",
+        "Calibrate:Monitor? 1": "100",
+        "Calibrate:Power? 1": "1.5 mW",
+        "Calibrate:Monitor? 2": "2000",
+        "Calibrate:Power? 2": "30.0 mW",
+    }
+    entries, err_code, _ = laser.get_calibration_lut()
+    assert entries == [(100.0, 1.5), (2000.0, 30.0)]
+    assert err_code == 0
+    # The number of entries, then every entry in one compound query
+    assert len(laser.pyvisa_serial.written) == 2
+
+
+def test_get_calibration_lut_transport_error(laser, monkeypatch):
+    def timeout(message):
+        raise VisaIOError(StatusCode.error_timeout)
+
+    monkeypatch.setattr(laser.pyvisa_serial, "write", timeout)
+    assert laser.get_calibration_lut() == (
+        [],
+        TRANSPORT_ERROR,
+        "TRANSPORT_ERROR",
+    )
+
+
+def test_query_errors_are_typed(laser, monkeypatch):
+    monkeypatch.setattr(
+        laser.pyvisa_serial,
+        "read_bytes",
+        lambda *args, **kwargs: b"garbage\r\n",
+    )
+    assert laser._safe_scpi_query("TEC:SETpoint? 0")[:2] == ("", PARSE_ERROR)
+
+    def timeout(message):
+        raise VisaIOError(StatusCode.error_timeout)
+
+    monkeypatch.setattr(laser.pyvisa_serial, "write", timeout)
+    assert laser._safe_scpi_query("TEC:SETpoint? 0")[:2] == (
+        "",
+        TRANSPORT_ERROR,
+    )
+    assert laser.set_tec_setpoint(25.0)[0] == TRANSPORT_ERROR
+
+
+def test_unplugged_port_is_a_transport_error(laser, monkeypatch):
+    def unplugged(message):
+        raise SerialException(
+            "device reports readiness to read but returned no data"
+        )
+
+    monkeypatch.setattr(laser.pyvisa_serial, "write", unplugged)
+    assert laser._safe_scpi_query("TEC:SETpoint? 0")[:2] == (
+        "",
+        TRANSPORT_ERROR,
+    )
+    assert laser.set_tec_setpoint(25.0)[0] == TRANSPORT_ERROR
+
+
+def test_unchecked_laser_skips_error_query():
+    laser = IpsLaser(check_errors=False)
+    laser.pyvisa_serial = FakeSession({"TEC:SETpoint? 0": "30.0"})
+    laser.isconnected = True
+    assert laser.get_tec_setpoint() == (30.0, 0, "NO_ERROR")
+    assert laser.pyvisa_serial.written == ["TEC:SETpoint? 0"]
+
+
+def test_unchecked_pipeline_skips_error_query(monkeypatch):
+    laser = IpsLaser(check_errors=False)
+    laser.pyvisa_serial = FakeSession(
+        {"TEC:SETpoint? 0": "30.0", "TEC:SETpoint? 1": "25.5"}
+    )
+    laser.isconnected = True
+    # The compound reply lacks the second answer
+    replies = [b"30.0\r\n", b"30.0\r\n", b"25.5\r\n"]
+    monkeypatch.setattr(
+        laser.pyvisa_serial,
+        "read_bytes",
+        lambda *args, **kwargs: replies.pop(0),
+    )
+    queries = ("TEC:SETpoint? 0", "TEC:SETpoint? 1")
+    assert laser._safe_scpi_compound(queries) == (
+        ["30.0", "25.5"],
+        0,
+        "NO_ERROR",
+    )
+    assert laser.pyvisa_serial.written == [";".join(queries), *queries]
+
+
+def test_get_fast_status_only_reads_enable(laser):
+    laser.pyvisa_serial.answers = {
+        "*IDN?": "LUMED,IPS,SN01,976,1.0",
+        "Laser:Enable?": "0",
+        "Laser:Current?": "42.0 mA",
+        "Laser:Power?": "10.0 mW",
+        "Laser:Temperature?": "25.0 C",
+    }
+    laser.get_info()
+    laser.pyvisa_serial.answers["Laser:Enable?"] = "1"
+    laser.pyvisa_serial.written.clear()
+    laser.get_fast_status()
+    assert laser.info.is_enabled
+    assert laser.info.laser_current == 42.0
+    assert laser.pyvisa_serial.written == ["Laser:Enable?;Error?"]
+
+
+def test_pulse_errors_are_typed(laser, monkeypatch):
+    assert laser.pulse(1) == (0, "NO_ERROR")
+    assert laser.pyvisa_serial.written == [
+        "Laser:Enable 1",
+        "Laser:Enable 0",
+        "Error?",
+    ]
+
+    def timeout(message):
+        raise VisaIOError(StatusCode.error_timeout)
+
+    monkeypatch.setattr(laser.pyvisa_serial, "write", timeout)
+    assert laser.pulse(1)[0] == TRANSPORT_ERROR
+    assert not laser.isenabled
+
+
+def test_flush_errors_stops_on_unreadable_reply(laser, monkeypatch):
+    replies = [b'-113,"Undefined header"\r\n', b"garbage\r\n"]
+    monkeypatch.setattr(
+        laser.pyvisa_serial,
+        "read_bytes",
+        lambda *args, **kwargs: replies.pop(0),
+    )
+    assert laser.flush_errors() == [
+        (-113, "Undefined header"),
+        (PARSE_ERROR, "PARSE_ERROR"),
+    ]
+
+    def timeout(message):
+        raise VisaIOError(StatusCode.error_timeout)
+
+    monkeypatch.setattr(laser.pyvisa_serial, "write", timeout)
+    assert laser.flush_errors() == [(TRANSPORT_ERROR, "TRANSPORT_ERROR")]
+
+
+def test_find_ips_laser_only_probes_stm32_ports(monkeypatch):
+    monkeypatch.setattr(ips_control.sys, "platform", "win32")
+    monkeypatch.setattr(
+        ips_control.list_ports,
+        "comports",
+        lambda: [
+            SimpleNamespace(device="COM3", vid=0x2341, pid=0x0043),
+            SimpleNamespace(device="COM4", vid=0x0483, pid=0x5740),
+        ],
+    )
+    monkeypatch.setattr(IpsLaser, "_list_serial_resources", lambda self: {})
+    probed = []
+
+    def probe(self, resource_name, *args):
+        probed.append(resource_name)
+        return "LUMED,IPS,SN01,976,1.0"
+
+    monkeypatch.setattr(IpsLaser, "_probe_port", probe)
+    assert list(IpsLaser().find_ips_laser(force=True)) == ["ASRLCOM4::INSTR"]
+    assert probed == ["ASRLCOM4::INSTR"]
+    ips_control.invalidate_discovery_cache()
+
+
+@pytest.mark.parametrize(
+    "error_reply, expected",
+    [
+        (b'0,"NO_ERROR"\r\n', (["30.0", "25.5"], 0, "NO_ERROR")),
+        (b"garbage\r\n", (["", ""], PARSE_ERROR, "PARSE_ERROR")),
+    ],
+)
+def test_compound_falls_back_to_pipelined_queries(
+    laser, monkeypatch, error_reply, expected
+):
+    # The compound reply lacks the second answer
+    replies = [b'30.0;0,"NO_ERROR"\r\n', b"30.0\r\n", b"25.5\r\n", error_reply]
+    monkeypatch.setattr(
+        laser.pyvisa_serial,
+        "read_bytes",
+        lambda *args, **kwargs: replies.pop(0),
+    )
+    queries = ("TEC:SETpoint? 0", "TEC:SETpoint? 1")
+    assert laser._safe_scpi_compound(queries) == expected
+    assert laser.pyvisa_serial.written[1:] == [*queries, "Error?"]
+
+
+def test_compound_pipeline_transport_error(laser, monkeypatch):
+    write = laser.pyvisa_serial.write
+
+    def timeout(message):
+        # Only the compound query goes through
+        if "Error?" in message and ";" in message:
+            write(message)
+            laser.pyvisa_serial._reply = b'30.0;0,"NO_ERROR"\r\n'
+            return
+        raise VisaIOError(StatusCode.error_timeout)
+
+    monkeypatch.setattr(laser.pyvisa_serial, "write", timeout)
+    assert laser._safe_scpi_compound(
+        ("TEC:SETpoint? 0", "TEC:SETpoint? 1")
+    ) == (["", ""], TRANSPORT_ERROR, "TRANSPORT_ERROR")
+
+
+def test_get_info_reads_idn_again_after_transport_error(laser, monkeypatch):
+    laser.pyvisa_serial.answers = {
+        "*IDN?": "LUMED,IPS,SN01,976,1.0",
+        "Laser:Enable?": "0",
+        "Laser:Current?": "42.0 mA",
+        "Laser:Power?": "10.0 mW",
+        "Laser:Temperature?": "25.0 C",
+    }
+    write = laser.pyvisa_serial.write
+
+    def timeout(message):
+        raise VisaIOError(StatusCode.error_timeout)
+
+    monkeypatch.setattr(laser.pyvisa_serial, "write", timeout)
+    laser.get_info()
+    assert laser.idn is None
+    assert not laser.info.is_connected
+
+    monkeypatch.setattr(laser.pyvisa_serial, "write", write)
+    laser.get_info()
+    assert laser.info.serial_number == "SN01"
+    assert laser.info.laser_current == 42.0
+
+
+@pytest.mark.parametrize(
+    "string, expected",
+    [
+        ("30", 30.0),
+        (" -2.5 ", -2.5),
+        ("42.0 mA", 42.0),
+        ("784nm", 784.0),
+        ("1e5", 1.0),
+        ("1_0", 1.0),
+        ("+5", math.nan),
+        ("1.", math.nan),
+        ("nan", math.nan),
+        ("", math.nan),
+    ],
+)
+def test_str2float(string, expected):
+    assert str2float(string) == pytest.approx(expected, nan_ok=True)
+
+
+def test_compound_requeries_unanswered_queries(laser, monkeypatch):
+    replies = [
+        b'30.0;;-113,"Undefined header"\r\n',
+        b'25.5;0,"NO_ERROR"\r\n',
+    ]
+    monkeypatch.setattr(
+        laser.pyvisa_serial,
+        "read_bytes",
+        lambda *args, **kwargs: replies.pop(0),
+    )
+    queries = ("TEC:SETpoint? 0", "TEC:SETpoint? 1")
+    # The error of the compound reply is not lost by the second query
+    assert laser._safe_scpi_compound(queries) == (
+        ["30.0", "25.5"],
+        -113,
+        "Undefined header",
+    )
+    assert laser.pyvisa_serial.written[1:] == ["TEC:SETpoint? 1;Error?"]
+
+
+@pytest.mark.parametrize("isconnected", [False, True])
+def test_find_ips_laser_does_not_reopen_the_held_port(
+    laser, monkeypatch, isconnected
+):
+    monkeypatch.setattr(ips_control.sys, "platform", "linux")
+    monkeypatch.setattr(
+        ips_control, "_find_stm32_vcp_tty", lambda: ["/dev/ttyACM0"]
+    )
+    probed = []
+
+    def probe(self, resource_name, *args):
+        probed.append(resource_name)
+        return "LUMED,IPS,SN01,976,1.0"
+
+    monkeypatch.setattr(IpsLaser, "_probe_port", probe)
+    session = laser.pyvisa_serial
+    laser.isconnected = isconnected
+    laser.idn = "LUMED,IPS,SN01,976,1.0"
+    found = laser.find_ips_laser(force=True)
+    assert found["ASRL/dev/ttyACM0::INSTR"]["idn"] == laser.idn
+    # A soft disconnected session is closed before its port is probed, a
+    # connected laser is not probed
+    assert session.closed is not isconnected
+    assert probed == ([] if isconnected else ["ASRL/dev/ttyACM0::INSTR"])
+    ips_control.invalidate_discovery_cache()
+
+
+@pytest.mark.parametrize(
+    "error",
+    [SerialException("device disconnected"), RuntimeError("unexpected")],
+)
+def test_get_fast_status_survives_unplug(laser, monkeypatch, error):
+    laser.pyvisa_serial.answers = {
+        "*IDN?": "LUMED,IPS,SN01,976,1.0",
+        "Laser:Enable?": "1",
+        "Laser:Current?": "42.0 mA",
+        "Laser:Power?": "10.0 mW",
+        "Laser:Temperature?": "25.0 C",
+    }
+    laser.get_info()
+    assert laser.info.is_connected
+
+    def unplugged(message):
+        raise error
+
+    monkeypatch.setattr(laser.pyvisa_serial, "write", unplugged)
+    laser.get_fast_status()
+    assert laser.info == IPSInfo()
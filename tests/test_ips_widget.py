@@ -0,0 +1,102 @@
+"""
+Unit tests for the IPS widget and its laser poller, without hardware.
+
+The poller drives a fake laser that records the commands it receives.
+"""
+
+import os
+
+import pytest
+from PyQt5 import sip
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication
+
+from lumed_ips.ips_control import IPSInfo
+from lumed_ips.ips_widget import IpsLaserWidget, LaserPoller
+
+
+class FakeLaser:
+    """Records the enable, current, pulse and disconnect commands."""
+
+    def __init__(self):
+        self.info = IPSInfo(is_connected=True)
+        self.target_current = 0
+        self.commands: list[tuple] = []
+
+    def set_enable(self, enable: bool) -> tuple[int, str]:
+        self.commands.append(("enable", enable))
+        self.info = IPSInfo(is_connected=True, is_enabled=enable)
+        return 0, "NO_ERROR"
+
+    def set_laser_current(self, current: int) -> tuple[int, str]:
+        self.commands.append(("current", current))
+        self.target_current = current
+        return 0, "NO_ERROR"
+
+    def pulse(self, duration_ms: float) -> tuple[int, str]:
+        self.commands.append(("pulse", duration_ms))
+        return 0, "NO_ERROR"
+
+    def soft_disconnect(self) -> bool:
+        self.commands.append(("soft_disconnect",))
+        return True
+
+
+@pytest.fixture(scope="module")
+def app():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def poller():
+    return LaserPoller(FakeLaser())
+
+
+def test_enable_requests_are_coalesced(poller):
+    poller.request_enable(True)
+    poller.request_enable(False)
+    poller.request_enable(True)
+    assert poller._write_pending()
+    assert poller.laser.commands == [("enable", True)]
+    # Already in the requested state
+    poller.request_enable(True)
+    assert not poller._write_pending()
+
+
+def test_pulse_is_not_dropped_by_a_later_disable(poller):
+    poller.request_enable(True)
+    pulse_id = poller.request_pulse(1)
+    assert pulse_id == poller._enable_request_id
+    poller.request_enable(False)
+    assert poller._write_pending()
+    # The laser ends the pulse disabled, the disable is not written again
+    assert poller.laser.commands == [("pulse", 1)]
+
+
+def test_enable_after_pulse_is_written(poller):
+    poller.laser.set_enable(True)
+    poller.laser.commands.clear()
+    poller.request_pulse(5)
+    poller.request_enable(True)
+    poller._write_pending()
+    assert poller.laser.commands == [("pulse", 5), ("enable", True)]
+
+
+def test_soft_disconnect_drops_pending_requests(poller):
+    poller.request_enable(True)
+    poller.request_pulse(5)
+    poller.request_current(100)
+    poller.soft_disconnect()
+    assert not poller._write_pending()
+    assert poller.laser.commands == [("soft_disconnect",)]
+
+
+def test_deleted_widget_stops_its_poll_thread(app):
+    widget = IpsLaserWidget()
+    finished = []
+    widget.poll_thread.finished.connect(
+        lambda: finished.append(True), Qt.DirectConnection
+    )
+    sip.delete(widget)
+    assert finished == [True]
@@ -3,7 +3,8 @@ Hardware smoke tests for the IPS laser controller.
 
 These tests validate the minimum end-to-end workflow against real hardware:
 - Instantiate an `IpsLaser` controller object
-- Discover a connected IPS laser via `find_ips_laser()`
+- Discover a connected IPS laser via `find_ips_laser()`, once per session
+  (see the `discovered_laser` fixture)
 - Connect to the first discovered instrument
 - Disconnect cleanly
 
@@ -35,21 +36,10 @@ def test_create_laser_object():
     assert hasattr(laser, "find_ips_laser")
 
 
-def test_find_connect_disconnect_smoke():
+def test_find_connect_disconnect_smoke(discovered_laser):
     laser = IpsLaser()
 
-    log.info("Discovering IPS laser instruments via find_ips_laser() ...")
-    found = laser.find_ips_laser()
-
-    if not found:
-        pytest.skip("No IPS laser found. Plug it in and re-run this test.")
-
-    log.info("Found %d candidate resource(s):", len(found))
-    for name, meta in found.items():
-        idn = (meta.get("idn") or "<no idn>").strip()
-        log.info("  - %s (IDN: %s)", name, idn)
-
-    resource_name = next(iter(found.keys()))
+    resource_name = _pick_first_resource(discovered_laser)
     log.info("Selecting first resource: %s", resource_name)
 
     log.info("Connecting ...")